@@ -0,0 +1,386 @@
+"""Benchmarks for loading, filtering, ranking and figure construction.
+
+Each case runs against the shipped 2025 summary CSVs and against synthetic
+copies scaled 10x (and 100x when asked for). A scaled season adds renamed
+copies of every pitcher to the same team, with metrics jittered by a fixed
+seed, so teams, pitch types and leaderboards grow like a bigger league would.
+
+Every case reports the best and median wall time over the repeats, plus the
+peak memory of one extra run traced with tracemalloc (allocations made by
+Python and NumPy; Arrow's own buffers are not traced). Results are written as
+JSON so two revisions can be compared:
+
+    python benchmarks.py --out after.json
+    python benchmarks.py --scales 1 10 100 --cases load_csv rankings_lookup
+
+The cases go through this revision's modules when they import. On an older
+checkout they fall back to the baseline dashboard's code paths (plain CSV
+reads, boolean masks, sort_values and nlargest, and the figure functions
+defined in pitcher_dashboard.py, loaded without running the app), so copy this
+script into an older checkout to record the "before" side:
+
+    cp benchmarks.py /tmp && git checkout <old revision>
+    python /tmp/benchmarks.py --out before.json
+    git checkout - && python benchmarks.py --out after.json --compare before.json
+
+Cases the older revision has no equivalent for (snapshots, index builds) are
+skipped there. Each result records which code path it ran through.
+"""
+import argparse
+import ast
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+import plotly.express as px
+
+# Import the modules of the checkout it runs in, even when this script is a copy kept outside it
+sys.path.insert(0, os.getcwd())
+try:
+    from pitcher_data import PitcherDataset, RankingIndex
+    from summary_snapshot import load_summaries, read_summary_csv
+    DATA_API = 'pitcher_data' if hasattr(PitcherDataset, 'qualified_overall') else 'baseline'
+except ImportError:
+    DATA_API = 'baseline'
+
+DEFAULT_SCALES = [1, 10]
+DEFAULT_REPEAT = 5
+SEED = 2025
+# Relative jitter applied to the metrics of scaled copies
+METRIC_JITTER = 0.03
+MIN_PITCHES = 50
+# Slow cases run fewer repeats so a 100x season finishes in reasonable time
+CASE_TIME_BUDGET = 30.0
+
+PITCH_TYPE_SUMMARY_FILE = 'pitcher_pitch_type_summary_2025.csv'
+OVERALL_SUMMARY_FILE = 'pitcher_overall_summary_2025.csv'
+DASHBOARD_FILE = 'pitcher_dashboard.py'
+FIGURE_FUNCTIONS = ['create_movement_plot', 'create_strike_zone_plot', 'create_performance_matrix']
+
+
+def scale_season(pitch_type_df, overall_df, factor, seed=SEED):
+    """Summary tables with factor renamed, jittered copies of every pitcher"""
+    if factor == 1:
+        return pitch_type_df, overall_df
+    rng = np.random.default_rng(seed)
+
+    def scaled(df):
+        copies = []
+        for copy in range(factor):
+            df_copy = df.copy()
+            if copy:
+                df_copy['Pitcher'] = df_copy['Pitcher'].astype(str) + f' #{copy + 1}'
+                for col in df_copy.columns:
+                    if df_copy[col].dtype.kind == 'f':
+                        jitter = rng.normal(1.0, METRIC_JITTER, len(df_copy))
+                        df_copy[col] = (df_copy[col].to_numpy(dtype='float64') * jitter).round(1)
+            copies.append(df_copy)
+        return pd.concat(copies, ignore_index=True)
+
+    return scaled(pitch_type_df), scaled(overall_df)
+
+
+def write_season(pitch_type_df, overall_df, directory):
+    """Write a season's summary CSVs and return their paths"""
+    pitch_type_path = os.path.join(directory, PITCH_TYPE_SUMMARY_FILE)
+    overall_path = os.path.join(directory, OVERALL_SUMMARY_FILE)
+    pitch_type_df.to_csv(pitch_type_path, index=False)
+    overall_df.to_csv(overall_path, index=False)
+    return pitch_type_path, overall_path
+
+
+def measure(func, repeat, budget=CASE_TIME_BUDGET):
+    """Best and median wall time over the timed runs, and the peak traced memory of one more
+
+    A warm-up run comes first; cases whose warm-up is slow get fewer timed
+    runs (at least one) so each case stays within roughly the time budget.
+    """
+    start = time.perf_counter()
+    func()
+    warmup = time.perf_counter() - start
+    runs = max(1, min(repeat, int(budget / max(warmup, 1e-9))))
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'runs': runs, 'best_s': min(times), 'median_s': statistics.median(times), 'peak_bytes': peak}
+
+
+def location_rows(pitch_type_rows, seed=SEED):
+    """Average plate locations for a pitcher's pitch types, for the strike zone plot"""
+    rng = np.random.default_rng(seed)
+    rows = pitch_type_rows[['Pitcher', 'PitcherTeam', 'TaggedPitchType', 'Pitch_Count']].copy()
+    rows['PlateLocSide'] = rng.normal(0.0, 0.5, len(rows))
+    rows['PlateLocHeight'] = rng.normal(2.4, 0.4, len(rows))
+    return rows
+
+
+def dashboard_functions(path=DASHBOARD_FILE, names=FIGURE_FUNCTIONS):
+    """Functions defined in a dashboard script, loaded without running the app
+
+    Only the script's imports, call-free assignments (like the Plotly
+    template) and function definitions are executed, with decorators such as
+    st.cache_data dropped.
+    """
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read(), path)
+    body = []
+    for node in tree.body:
+        if isinstance(node, ast.FunctionDef):
+            node.decorator_list = []
+            body.append(node)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            body.append(node)
+        elif isinstance(node, ast.Assign) and not any(isinstance(n, ast.Call) for n in ast.walk(node.value)):
+            body.append(node)
+    namespace = {}
+    exec(compile(ast.Module(body, type_ignores=[]), path, 'exec'), namespace)
+    return {name: namespace[name] for name in names if name in namespace}
+
+
+def baseline_performance_matrix(overall_rows, template):
+    """The Performance Matrix as the baseline dashboard built it inline"""
+    fig_scatter = px.scatter(
+        overall_rows,
+        x='Overall_StuffPlus',
+        y='Overall_PitchingPlus',
+        hover_data=['Pitcher', 'PitcherTeam', 'Total_Pitches'],
+        size='Total_Pitches',
+        color='Total_Pitches',
+        title="<b>Stuff+ vs Pitching+</b>",
+        labels={
+            'Overall_StuffPlus': 'Stuff+',
+            'Overall_PitchingPlus': 'Pitching+',
+            'Total_Pitches': 'Pitches'
+        },
+        color_continuous_scale='Plasma'
+    )
+    fig_scatter.add_hline(y=100, line_dash="dash", line_color="#666", opacity=0.5)
+    fig_scatter.add_vline(x=100, line_dash="dash", line_color="#666", opacity=0.5)
+    fig_scatter.update_layout(template=template, height=600)
+    return fig_scatter
+
+
+def figure_functions():
+    """Figure builders from pitcher_figures, else from the dashboard script, and where they came from"""
+    try:
+        import pitcher_figures
+        functions = {name: getattr(pitcher_figures, name) for name in FIGURE_FUNCTIONS if hasattr(pitcher_figures, name)}
+    except ImportError:
+        functions = {}
+    if len(functions) == len(FIGURE_FUNCTIONS):
+        return functions, 'pitcher_figures'
+
+    functions.update(dashboard_functions(names=FIGURE_FUNCTIONS + ['plotly_template']))
+    if 'create_performance_matrix' not in functions:
+        template = functions['plotly_template']
+        functions['create_performance_matrix'] = lambda rows: baseline_performance_matrix(rows, template)
+    return functions, DASHBOARD_FILE
+
+
+def build_indexes(data):
+    """A fresh dataset over the same frames with every lazily built index in place"""
+    dataset = PitcherDataset(data.pitch_type_df, data.overall_df)
+    return dataset.search, dataset.pitch_type_percentiles, dataset.similarity, dataset.arsenals
+
+
+def build_rankings(data):
+    """Every leaderboard sorted; older revisions sort them all in the constructor"""
+    rankings = RankingIndex(data.pitch_type_df, data.overall_df)
+    return rankings.build() if hasattr(rankings, 'build') else rankings
+
+
+def dataset_cases(pitch_type_path, overall_path, snapshot_dir):
+    """Data cases through PitcherDataset, and the rows the figure cases draw"""
+    data = PitcherDataset(read_summary_csv(pitch_type_path), read_summary_csv(overall_path))
+    team = max(data.teams, key=lambda team: len(data.team_overall(team)))
+    arsenal = data.pitcher_pitch_types(data.busiest_pitchers(1)[0])
+    qualified = data.qualified_overall(None, MIN_PITCHES)
+    load_summaries(pitch_type_path, overall_path, snapshot_dir)
+    rows = len(data.pitch_type_df) + len(data.overall_df)
+
+    cases = {
+        # load_data(): parse both CSVs, or read the Feather snapshots, into a dataset
+        'load_csv': (lambda: PitcherDataset(read_summary_csv(pitch_type_path), read_summary_csv(overall_path)), rows),
+        'load_snapshot': (lambda: PitcherDataset(*load_summaries(pitch_type_path, overall_path, snapshot_dir)), rows),
+        # Team and minimum pitch filters behind the Overview and Pitch Type Analysis views
+        'filter_team_min_pitches': (
+            lambda: (data.qualified_overall(team, MIN_PITCHES),
+                     data.qualified_pitch_types(team, 'Fastball', MIN_PITCHES)),
+            len(data.overall_df)
+        ),
+        # Rankings tab leaderboards, overall and one pitch type, read from the prebuilt index
+        'rankings_lookup': (
+            lambda: (data.rankings.ranked(None, None, 'Pitching+', MIN_PITCHES),
+                     data.rankings.ranked(None, 'Fastball', 'Stuff+', MIN_PITCHES)),
+            len(data.overall_df)
+        ),
+        # Sorting every leaderboard, which a server pays for up front in build_indexes()
+        'rankings_build': (lambda: build_rankings(data), rows),
+        # Overview top-10 tables, league-wide and for one team
+        'top_10': (
+            lambda: (data.rankings.top(None, None, 'Pitching+', MIN_PITCHES),
+                     data.rankings.top(None, None, 'Stuff+', MIN_PITCHES),
+                     data.rankings.top(team, None, 'Pitching+', MIN_PITCHES)),
+            len(data.overall_df)
+        ),
+        # A dataset with the search, percentile and similarity indexes a first profile visit builds
+        'dataset_with_indexes': (lambda: build_indexes(data), rows)
+    }
+    return cases, arsenal, qualified
+
+
+def baseline_cases(pitch_type_path, overall_path, snapshot_dir):
+    """The same data cases as the baseline dashboard ran them, on plain DataFrames"""
+    pitch_type_df, overall_df = pd.read_csv(pitch_type_path), pd.read_csv(overall_path)
+    team = overall_df['PitcherTeam'].value_counts().idxmax()
+    busiest = overall_df.nlargest(1, 'Total_Pitches').iloc[0]
+    arsenal = pitch_type_df[
+        (pitch_type_df['Pitcher'] == busiest['Pitcher']) & (pitch_type_df['PitcherTeam'] == busiest['PitcherTeam'])
+    ]
+    qualified = overall_df[overall_df['Total_Pitches'] >= MIN_PITCHES]
+
+    def qualified_overall(team):
+        rows = overall_df if team is None else overall_df[overall_df['PitcherTeam'] == team]
+        return rows[rows['Total_Pitches'] >= MIN_PITCHES]
+
+    def ranked(rows, count_col, sort_col):
+        return rows[rows[count_col] >= MIN_PITCHES].sort_values(sort_col, ascending=False).reset_index(drop=True)
+
+    def team_pitch_types(pitch_type):
+        rows = pitch_type_df[pitch_type_df['PitcherTeam'] == team]
+        return rows[(rows['TaggedPitchType'] == pitch_type) & (rows['Pitch_Count'] >= MIN_PITCHES)]
+
+    cases = {
+        'load_csv': (
+            lambda: (pd.read_csv(pitch_type_path), pd.read_csv(overall_path)),
+            len(pitch_type_df) + len(overall_df)
+        ),
+        'filter_team_min_pitches': (
+            lambda: (qualified_overall(team), team_pitch_types('Fastball')),
+            len(overall_df)
+        ),
+        'rankings_lookup': (
+            lambda: (ranked(overall_df, 'Total_Pitches', 'Overall_PitchingPlus'),
+                     ranked(pitch_type_df[pitch_type_df['TaggedPitchType'] == 'Fastball'], 'Pitch_Count', 'StuffPlus')),
+            len(overall_df)
+        ),
+        'top_10': (
+            lambda: (qualified_overall(None).nlargest(10, 'Overall_PitchingPlus'),
+                     qualified_overall(None).nlargest(10, 'Overall_StuffPlus'),
+                     qualified_overall(team).nlargest(10, 'Overall_PitchingPlus')),
+            len(overall_df)
+        )
+    }
+    return cases, arsenal, qualified
+
+
+def season_cases(pitch_type_path, overall_path, snapshot_dir):
+    """Benchmark name -> (callable, rows it reads, code path) for one season on disk"""
+    build_cases = dataset_cases if DATA_API == 'pitcher_data' else baseline_cases
+    cases, arsenal, qualified = build_cases(pitch_type_path, overall_path, snapshot_dir)
+    cases = {name: (func, rows, DATA_API) for name, (func, rows) in cases.items()}
+
+    figures, figure_api = figure_functions()
+    locations = location_rows(arsenal)
+    cases.update({
+        'movement_plot': (lambda: figures['create_movement_plot'](arsenal).to_json(), len(arsenal), figure_api),
+        'strike_zone_plot': (
+            lambda: figures['create_strike_zone_plot'](locations).to_json(), len(locations), figure_api
+        ),
+        'performance_matrix': (
+            lambda: figures['create_performance_matrix'](qualified).to_json(), len(qualified), figure_api
+        )
+    })
+    return cases
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run(scales=DEFAULT_SCALES, repeat=DEFAULT_REPEAT, cases=None):
+    """Results for every (case, scale) as a JSON-ready dict"""
+    # Plain CSV reads, so every revision benchmarks byte-identical scaled seasons
+    base = (pd.read_csv(PITCH_TYPE_SUMMARY_FILE), pd.read_csv(OVERALL_SUMMARY_FILE))
+    results = []
+    for scale in scales:
+        with tempfile.TemporaryDirectory() as directory:
+            paths = write_season(*scale_season(*base, scale), directory)
+            season = season_cases(*paths, os.path.join(directory, 'snapshots'))
+            for name, (func, rows, api) in season.items():
+                if cases and name not in cases:
+                    continue
+                result = {'case': name, 'scale': scale, 'rows': rows, 'api': api, **measure(func, repeat)}
+                results.append(result)
+                print(f"{name:<24} {scale:>4}x {rows:>10,} rows  "
+                      f"best {result['best_s'] * 1000:9.2f} ms  "
+                      f"median {result['median_s'] * 1000:9.2f} ms  "
+                      f"peak {result['peak_bytes'] / 2 ** 20:8.1f} MiB")
+    return {
+        'revision': git_revision(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+        'repeat': repeat,
+        'results': results
+    }
+
+
+def compare(results, baseline):
+    """Print the change in best time and peak memory against a baseline run"""
+    before = {(r['case'], r['scale']): r for r in baseline['results']}
+    print(f"\nCompared with {baseline.get('revision') or 'baseline'} ({baseline.get('created', '?')})")
+    for result in results['results']:
+        old = before.get((result['case'], result['scale']))
+        if old is None:
+            continue
+        time_ratio = result['best_s'] / old['best_s'] if old['best_s'] else float('nan')
+        memory_ratio = result['peak_bytes'] / old['peak_bytes'] if old['peak_bytes'] else float('nan')
+        print(f"{result['case']:<24} {result['scale']:>4}x  time {time_ratio:6.2f}x  memory {memory_ratio:6.2f}x"
+              f"  ({old.get('api', '?')} -> {result.get('api', '?')})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard's data and figure paths")
+    parser.add_argument('--scales', type=int, nargs='+', default=DEFAULT_SCALES,
+                        help="Season size multipliers (100 is supported but slow and memory hungry)")
+    parser.add_argument('--repeat', type=int, default=DEFAULT_REPEAT, help="Timed runs per case")
+    parser.add_argument('--cases', nargs='+', help="Only run these cases")
+    parser.add_argument('--out', help="Write results to this JSON file")
+    parser.add_argument('--compare', help="Baseline results JSON to compare against")
+    args = parser.parse_args()
+
+    results = run(args.scales, args.repeat, args.cases)
+    if args.out:
+        with open(args.out, 'w') as f:
+            json.dump(results, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            compare(results, json.load(f))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""Bounded LRU cache of serialized Plotly figures.
+
+Figures are stored as their JSON specs keyed on the filter state that produced
+them (view, team, pitcher, pitch type, threshold and the versions of the
+tables they read). The cache is bounded by the total size of the stored JSON;
+the least recently used specs are evicted first, and specs built from a
+replaced table version can be dropped with invalidate().
+"""
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class FigureCache:
+    """Thread-safe LRU cache of figure JSON with hit/miss counters"""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(self, key, build):
+        """Return the cached figure JSON for key, building it with build() on a miss"""
+        with self._lock:
+            fig_json = self._entries.get(key)
+            if fig_json is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return fig_json
+            self.misses += 1
+
+        # Build outside the lock so slow figures don't block other sessions
+        fig_json = build().to_json()
+
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = fig_json
+                self._size += len(fig_json)
+            while self._size > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+                self.evictions += 1
+        return fig_json
+
+    def invalidate(self, versions):
+        """Drop figures whose key includes any of the given table versions"""
+        versions = set(versions)
+        with self._lock:
+            for key in [key for key in self._entries if versions.intersection(key)]:
+                self._size -= len(self._entries.pop(key))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def stats(self):
+        """Counters for monitoring the cache"""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._size,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions
+            }
@@ -0,0 +1,109 @@
+"""Pitch location density grids.
+
+Every raw pitch's PlateLocSide/PlateLocHeight is binned into a fixed grid
+covering the strike zone plot. Grids are kept per (pitcher, team, pitch type)
+as sparse (cell, count) rows, since most pitchers only touch a fraction of
+the cells, and summed into league-wide grids per pitch type for comparison.
+"""
+import numpy as np
+import pandas as pd
+
+# 0.2 ft cells over the strike zone plot range (pitcher's view)
+GRID_X_EDGES = np.linspace(-2.5, 2.5, 26)
+GRID_Y_EDGES = np.linspace(-0.5, 4.5, 26)
+GRID_SHAPE = (len(GRID_Y_EDGES) - 1, len(GRID_X_EDGES) - 1)
+GRID_CELLS = GRID_SHAPE[0] * GRID_SHAPE[1]
+
+GRID_KEYS = ['Pitcher', 'PitcherTeam', 'TaggedPitchType']
+
+
+def _bin_index(values, edges):
+    """Bin index per value, -1 outside the edges (last edge inclusive, like np.histogram2d)"""
+    index = np.searchsorted(edges, values, side='right') - 1
+    index[values == edges[-1]] = len(edges) - 2
+    index[(values < edges[0]) | (values > edges[-1]) | np.isnan(values)] = -1
+    return index
+
+
+def bin_locations(raw):
+    """Sparse location counts per pitcher, team, pitch type and grid cell"""
+    side = raw['PlateLocSide'].to_numpy(dtype='float64')
+    height = raw['PlateLocHeight'].to_numpy(dtype='float64')
+    col = _bin_index(side, GRID_X_EDGES)
+    row = _bin_index(height, GRID_Y_EDGES)
+    groups = raw.groupby(GRID_KEYS, observed=True, sort=True).ngroup().to_numpy()
+    in_grid = (col >= 0) & (row >= 0) & (groups >= 0)
+
+    keys = groups[in_grid].astype('int64') * GRID_CELLS + row[in_grid] * GRID_SHAPE[1] + col[in_grid]
+    keys, counts = np.unique(keys, return_counts=True)
+
+    # First row of each group holds its keys, in group code order
+    codes, first_rows = np.unique(groups, return_index=True)
+    group_rows = raw[GRID_KEYS].iloc[first_rows[codes >= 0]].reset_index(drop=True)
+    sparse = group_rows.iloc[keys // GRID_CELLS].reset_index(drop=True)
+    sparse['cell'] = (keys % GRID_CELLS).astype('int16')
+    sparse['count'] = counts.astype('int32')
+    return sparse
+
+
+def smooth_grid(grid, sigma=1.0):
+    """Separable Gaussian smoothing of a grid, sigma in cells"""
+    if sigma <= 0:
+        return grid
+    radius = int(np.ceil(3 * sigma))
+    offsets = np.arange(-radius, radius + 1)
+    kernel = np.exp(-0.5 * (offsets / sigma) ** 2)
+    kernel /= kernel.sum()
+    # Zero-pad by the kernel radius and keep only full overlaps, so the shape is kept
+    # even when the kernel is wider than the grid
+    grid = np.pad(grid, radius)
+    grid = np.apply_along_axis(np.convolve, 0, grid, kernel, mode='valid')
+    return np.apply_along_axis(np.convolve, 1, grid, kernel, mode='valid')
+
+
+class LocationGrids:
+    """Lookup of per-pitcher and league location grids
+
+    pitcher_key turns a (pitcher, team) pair into the key pitcher grids are
+    looked up by.
+    """
+
+    def __init__(self, sparse, pitcher_key):
+        self._pitchers = {
+            pitcher_key(pitcher, team): rows.reset_index(drop=True)
+            for (pitcher, team), rows in sparse.groupby(['Pitcher', 'PitcherTeam'], observed=True)
+        }
+
+        # League grids: one dense array per pitch type
+        type_codes, pitch_types = pd.factorize(sparse['TaggedPitchType'].astype(str))
+        flat = np.bincount(
+            type_codes.astype('int64') * GRID_CELLS + sparse['cell'].to_numpy(),
+            weights=sparse['count'].to_numpy(),
+            minlength=len(pitch_types) * GRID_CELLS
+        )
+        league = flat.reshape(len(pitch_types), *GRID_SHAPE).astype('float32')
+        self._league = dict(zip(pitch_types, league))
+
+    def _dense(self, rows):
+        grid = np.bincount(rows['cell'].to_numpy(), weights=rows['count'].to_numpy(), minlength=GRID_CELLS)
+        return grid.reshape(GRID_SHAPE).astype('float32')
+
+    def pitcher_grid(self, pid, pitch_types=None, sigma=0):
+        """Count grid for one pitcher, optionally limited to some pitch types, or None"""
+        rows = self._pitchers.get(pid)
+        if rows is None:
+            return None
+        if pitch_types is not None:
+            rows = rows[rows['TaggedPitchType'].isin(pitch_types)]
+        if len(rows) == 0:
+            return None
+        return smooth_grid(self._dense(rows), sigma)
+
+    def league_grid(self, pitch_types=None, sigma=0):
+        """League-wide count grid, optionally limited to some pitch types"""
+        if pitch_types is None:
+            pitch_types = self._league
+        grids = [self._league[t] for t in pitch_types if t in self._league]
+        if not grids:
+            return None
+        return smooth_grid(np.sum(grids, axis=0), sigma)
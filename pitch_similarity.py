@@ -0,0 +1,153 @@
+"""Nearest-neighbour search for similarly shaped pitches.
+
+Pitch type rows are described by their average velocity, movement, spin,
+extension and release point. Horizontal break and release side are mirrored
+so that arm side is always positive, which lets left- and right-handers comp
+each other. Features are standardized and indexed in KD-trees, one over all
+pitches and one per pitch type, built once per dataset version.
+
+Whole arsenals are compared through a per-pitcher embedding: usage share of
+every pitch type, each pitch type's shape (standardized within its type and
+weighted by usage) and the pitcher's overall velocity and extension. The
+embedding has ~80 dimensions, where KD-trees lose to a scan, so the arsenal
+index is a dense float32 matrix with precomputed squared norms searched with
+one matrix-vector product.
+"""
+import numpy as np
+import pandas as pd
+
+SIMILARITY_FEATURES = [
+    'Avg_Velocity', 'Avg_InducedVert', 'Avg_HorzBreak', 'Avg_SpinRate',
+    'Avg_Extension', 'Avg_RelHeight', 'Avg_RelSide'
+]
+MIRRORED_FEATURES = ['Avg_HorzBreak', 'Avg_RelSide']
+
+# Rows with fewer pitches have averages too noisy to serve as comps
+SIMILARITY_MIN_PITCHES = 20
+
+# Per pitch type shape features and overall features in the arsenal embedding
+ARSENAL_SHAPE_FEATURES = ['Avg_Velocity', 'Avg_InducedVert', 'Avg_HorzBreak', 'Avg_SpinRate']
+ARSENAL_OVERALL_FEATURES = ['Avg_Velocity', 'Avg_Extension']
+# Usage shares are 0-1 while shapes are z-scores; this puts a 33-point mix
+# difference on par with a one standard deviation shape difference
+ARSENAL_USAGE_WEIGHT = 3.0
+
+
+def pitch_features(pitch_type_df):
+    """Feature matrix with horizontal values mirrored to the arm side"""
+    features = pitch_type_df[SIMILARITY_FEATURES].to_numpy(dtype='float64')
+    arm_side = np.where(pitch_type_df['Avg_RelSide'].to_numpy(dtype='float64') < 0, -1.0, 1.0)
+    for col in MIRRORED_FEATURES:
+        features[:, SIMILARITY_FEATURES.index(col)] *= arm_side
+    return features
+
+
+class PitchSimilarityIndex:
+    """Top-k comps for a pitch type row by standardized shape distance"""
+
+    def __init__(self, pitch_type_df, min_pitches=SIMILARITY_MIN_PITCHES):
+        # Imported here so loading a dataset doesn't pay for scipy until an index is built
+        from scipy.spatial import cKDTree
+
+        self._features = pitch_features(pitch_type_df)
+        pitch_types = pitch_type_df['TaggedPitchType'].astype(str).to_numpy()
+        self._pitch_types = pitch_types
+
+        indexed = np.isfinite(self._features).all(axis=1)
+        indexed &= pitch_type_df['Pitch_Count'].to_numpy() >= min_pitches
+        self._mean = self._features[indexed].mean(axis=0)
+        self._std = self._features[indexed].std(axis=0)
+        self._std[self._std == 0] = 1.0
+
+        # Positions into pitch_type_df for each tree's points
+        positions = np.flatnonzero(indexed)
+        self._trees = {None: (cKDTree(self._scale(self._features[positions])), positions)}
+        for pitch_type in np.unique(pitch_types[positions]):
+            type_positions = positions[pitch_types[positions] == pitch_type]
+            self._trees[pitch_type] = (cKDTree(self._scale(self._features[type_positions])), type_positions)
+
+    def _scale(self, features):
+        return (features - self._mean) / self._std
+
+    def similar(self, position, k=10, same_type=True, exclude=()):
+        """Positions and distances of the k nearest pitches to the row at position
+
+        Rows whose position is in exclude (e.g. the pitcher's own pitches) are skipped.
+        """
+        query = self._features[position]
+        if not np.isfinite(query).all():
+            return np.empty(0, dtype='int64'), np.empty(0)
+
+        tree, positions = self._trees.get(self._pitch_types[position] if same_type else None, (None, None))
+        if tree is None:
+            return np.empty(0, dtype='int64'), np.empty(0)
+
+        exclude = set(exclude) | {position}
+        n = min(k + len(exclude), tree.n)
+        distances, indices = tree.query(self._scale(query), k=n)
+        distances, indices = np.atleast_1d(distances), np.atleast_1d(indices)
+        matches = positions[indices]
+        keep = np.array([match not in exclude for match in matches.tolist()], dtype=bool)
+        return matches[keep][:k], distances[keep][:k]
+
+
+def _standardize(values):
+    """Z-scores per column, with missing values at the mean"""
+    mean = np.nanmean(values, axis=0)
+    std = np.nanstd(values, axis=0)
+    std[~(std > 0)] = 1.0
+    scaled = (values - mean) / std
+    scaled[~np.isfinite(scaled)] = 0.0
+    return scaled
+
+
+def arsenal_embedding(pitch_type_df, overall_df):
+    """Dense float32 matrix with one arsenal vector per overall_df row"""
+    keys = ['PitcherTeam', 'Pitcher']
+    pitcher_index = pd.MultiIndex.from_frame(overall_df[keys].astype(str))
+    rows = pitcher_index.get_indexer(pd.MultiIndex.from_frame(pitch_type_df[keys].astype(str)))
+    known = rows >= 0
+    rows = rows[known]
+    type_codes, pitch_types = pd.factorize(pitch_type_df['TaggedPitchType'].astype(str).to_numpy()[known])
+    n_pitchers, n_types = len(overall_df), len(pitch_types)
+
+    # Usage share of every pitch type
+    counts = pitch_type_df['Pitch_Count'].to_numpy(dtype='float64')[known]
+    totals = np.bincount(rows, weights=counts, minlength=n_pitchers)
+    shares = counts / np.where(totals[rows] > 0, totals[rows], 1.0)
+    usage = np.zeros((n_pitchers, n_types))
+    usage[rows, type_codes] = shares
+
+    # Shape of each pitch type, standardized within the type and weighted by usage
+    features = pitch_features(pitch_type_df)[known][:, [SIMILARITY_FEATURES.index(f) for f in ARSENAL_SHAPE_FEATURES]]
+    shape = np.empty_like(features)
+    for code in range(n_types):
+        in_type = type_codes == code
+        shape[in_type] = _standardize(features[in_type])
+    shapes = np.zeros((n_pitchers, n_types * len(ARSENAL_SHAPE_FEATURES)))
+    columns = type_codes[:, None] * len(ARSENAL_SHAPE_FEATURES) + np.arange(len(ARSENAL_SHAPE_FEATURES))
+    shapes[rows[:, None], columns] = shape * shares[:, None]
+
+    overall = _standardize(overall_df[ARSENAL_OVERALL_FEATURES].to_numpy(dtype='float64'))
+    return np.hstack([usage * ARSENAL_USAGE_WEIGHT, shapes, overall]).astype('float32')
+
+
+class ArsenalSimilarityIndex:
+    """Top-k pitchers with the most similar arsenals, by embedding distance"""
+
+    def __init__(self, pitch_type_df, overall_df):
+        self._embedding = arsenal_embedding(pitch_type_df, overall_df)
+        self._embedding.flags.writeable = False
+        self._norms = np.einsum('ij,ij->i', self._embedding, self._embedding)
+
+    def similar(self, position, k=10):
+        """Overall row positions and distances of the k nearest arsenals to the one at position"""
+        query = self._embedding[position]
+        distances = self._norms - 2 * (self._embedding @ query) + self._norms[position]
+        distances[position] = np.inf
+        k = min(k, len(distances) - 1)
+        if k <= 0:
+            return np.empty(0, dtype='int64'), np.empty(0)
+        nearest = np.argpartition(distances, k - 1)[:k]
+        nearest = nearest[np.argsort(distances[nearest], kind='stable')]
+        return nearest, np.sqrt(np.maximum(distances[nearest], 0))
@@ -0,0 +1,146 @@
+"""Precomputed location store for the raw pitch file.
+
+The ingest step reads pitching_2025.csv once and writes a per-(pitcher, team,
+pitch type) plate location summary and sparse location density grids. That is
+all the strike zone views read, so the dashboard never scans raw pitches once
+the store is built. store.json records the raw file's signature; a store older
+than the raw file is ignored until it is rebuilt.
+
+Usage:
+    python pitch_store.py pitching_2025.csv --out pitch_store
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from location_density import LocationGrids, bin_locations
+
+RAW_PITCH_FILE = 'pitching_2025.csv'
+PITCH_STORE_DIR = 'pitch_store'
+STORE_META_FILE = 'store.json'
+LOCATION_SUMMARY_FILE = 'location_summary.parquet'
+LOCATION_GRIDS_FILE = 'location_grids.parquet'
+
+# Only the raw columns the dashboard uses, with compact dtypes
+RAW_PITCH_DTYPES = {
+    'Pitcher': 'category',
+    'PitcherTeam': 'category',
+    'TaggedPitchType': 'category',
+    'PlateLocSide': 'float32',
+    'PlateLocHeight': 'float32'
+}
+
+
+def file_signature(path):
+    """Size and modification time used to detect a changed source file"""
+    stat = os.stat(path)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}
+
+
+def pitcher_id(pitcher, team):
+    """Stable pitcher key; the same name can appear on more than one team"""
+    return f'{team}/{pitcher}'
+
+
+def has_raw_columns(path=RAW_PITCH_FILE):
+    """Check the raw file header for the needed columns without parsing any rows"""
+    try:
+        header = pd.read_csv(path, nrows=0).columns
+    except (FileNotFoundError, pd.errors.EmptyDataError):
+        return False
+    return set(RAW_PITCH_DTYPES).issubset(header)
+
+
+def read_raw_pitches(path=RAW_PITCH_FILE):
+    """Read the needed raw pitch columns with compact dtypes"""
+    return pd.read_csv(
+        path,
+        usecols=list(RAW_PITCH_DTYPES),
+        dtype=RAW_PITCH_DTYPES
+    )
+
+
+def summarize_locations(raw):
+    """Mean, median, SD and count of plate location per pitcher, team and pitch type"""
+    keys = ['Pitcher', 'PitcherTeam', 'TaggedPitchType']
+    grouped = raw.groupby(keys, observed=True)
+    summary = grouped[['PlateLocSide', 'PlateLocHeight']].agg(['mean', 'median', 'std', 'count'])
+    summary.columns = [f'{col}_{stat}' for col, stat in summary.columns]
+    summary['Pitch_Count'] = grouped.size()
+    summary = summary.astype({
+        col: 'int32' if col.endswith('_count') or col == 'Pitch_Count' else 'float32'
+        for col in summary.columns
+    })
+    return summary.reset_index()
+
+
+def location_lookup(summary):
+    """Split a location summary into per-pitcher ID frames ready to plot"""
+    summary = summary.rename(columns={
+        'PlateLocSide_mean': 'PlateLocSide',
+        'PlateLocHeight_mean': 'PlateLocHeight'
+    })
+    return {
+        pitcher_id(pitcher, team): rows.reset_index(drop=True)
+        for (pitcher, team), rows in summary.groupby(['Pitcher', 'PitcherTeam'], observed=True)
+    }
+
+
+def location_grids(sparse):
+    """Location grids looked up by pitcher ID"""
+    return LocationGrids(sparse, pitcher_id)
+
+
+def load_location_summary(store_dir=PITCH_STORE_DIR):
+    """Read the location summary written at ingest"""
+    return pd.read_parquet(os.path.join(store_dir, LOCATION_SUMMARY_FILE))
+
+
+def load_location_grids(store_dir=PITCH_STORE_DIR):
+    """Read the sparse location grids written at ingest"""
+    return location_grids(pd.read_parquet(os.path.join(store_dir, LOCATION_GRIDS_FILE)))
+
+
+def build_pitch_store(csv_path=RAW_PITCH_FILE, store_dir=PITCH_STORE_DIR):
+    """Write the location summary and grids, then the marker recording which raw file they came from"""
+    raw = read_raw_pitches(csv_path).dropna(subset=['Pitcher', 'PitcherTeam'])
+    os.makedirs(store_dir, exist_ok=True)
+
+    summary = summarize_locations(raw)
+    summary.to_parquet(os.path.join(store_dir, LOCATION_SUMMARY_FILE), index=False)
+    bin_locations(raw).to_parquet(os.path.join(store_dir, LOCATION_GRIDS_FILE), index=False)
+
+    with open(os.path.join(store_dir, STORE_META_FILE), 'w') as f:
+        json.dump({'source': file_signature(csv_path), 'columns': list(RAW_PITCH_DTYPES)}, f)
+
+    return summary
+
+
+def store_is_current(store_dir=PITCH_STORE_DIR, csv_path=RAW_PITCH_FILE):
+    """Whether the store has been built and is not older than the raw file"""
+    try:
+        with open(os.path.join(store_dir, STORE_META_FILE)) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+
+    # A rebuilt raw file makes the store stale; fall back to the CSV until re-ingested
+    return not os.path.exists(csv_path) or meta.get('source') == file_signature(csv_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the precomputed location store")
+    parser.add_argument('csv', nargs='?', default=RAW_PITCH_FILE, help="Raw pitch CSV")
+    parser.add_argument('--out', default=PITCH_STORE_DIR, help="Output store directory")
+    args = parser.parse_args()
+
+    summary = build_pitch_store(args.csv, args.out)
+    pitchers = len(summary[['Pitcher', 'PitcherTeam']].drop_duplicates())
+    print(f"Wrote location summaries and grids for {summary['Pitch_Count'].sum():,} pitches "
+          f"by {pitchers:,} pitchers to {args.out}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,399 @@
+"""Read-only JSON API over the pitcher summary tables.
+
+A single asyncio process serves leaderboards, pitcher profiles and pitch type
+slices from the same in-memory PitcherDataset the dashboard uses. Every index
+is built before the first request, and a background task checks the CSVs
+through a DatasetWatcher in a worker thread, so a reload and its index builds
+never block the event loop; requests keep reading the old dataset until the
+new one is ready. Responses are cached by (dataset version, path, query)
+and carry an ETag derived from the same key, so a client sending
+If-None-Match gets a 304 without the body being rebuilt or resent.
+
+Usage:
+    python pitcher_api.py --port 8502
+
+Endpoints (GET or HEAD):
+    /teams
+    /pitch-types
+    /rankings?team=&pitch_type=&metric=Pitching%2B&min_pitches=0&limit=100
+    /pitchers?q=&team=&limit=20
+    /pitchers/<team>/<name>?similar=10
+    /pitch-types/<pitch type>?team=&min_pitches=0&limit=100
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from urllib.parse import parse_qsl, unquote, urlsplit
+
+import numpy as np
+
+from pitcher_data import OVERALL_METRICS, DatasetWatcher
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8502
+RESPONSE_CACHE_ENTRIES = 4096
+DEFAULT_ROW_LIMIT = 100
+MAX_ROW_LIMIT = 5000
+FLOAT_DECIMALS = 3
+# Requests larger than this are rejected rather than buffered
+MAX_HEADER_BYTES = 16 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+
+STATUS_TEXT = {
+    200: 'OK', 304: 'Not Modified', 400: 'Bad Request', 404: 'Not Found',
+    405: 'Method Not Allowed', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error'
+}
+
+
+class ApiError(Exception):
+    """Error returned to the client as {"error": message} with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+def _value(value):
+    """JSON-ready scalar, with float32 noise rounded away"""
+    if isinstance(value, (float, np.floating)):
+        return None if np.isnan(value) else round(float(value), FLOAT_DECIMALS)
+    if isinstance(value, np.integer):
+        return int(value)
+    return None if value is None else str(value)
+
+
+def _records(df):
+    """JSON-ready list of row dicts, converted a column at a time"""
+    columns = {}
+    for col in df.columns:
+        values = df[col].to_numpy()
+        if values.dtype.kind == 'f':
+            values = np.round(values.astype('float64'), FLOAT_DECIMALS)
+            columns[col] = [None if np.isnan(v) else v for v in values.tolist()]
+        elif values.dtype.kind in 'iub':
+            columns[col] = values.tolist()
+        else:
+            columns[col] = [None if v is None or v != v else str(v) for v in values.tolist()]
+    names = list(columns)
+    return [dict(zip(names, row)) for row in zip(*columns.values())]
+
+
+def _param(params, name, default=None, cast=str, choices=None):
+    value = params.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        value = cast(value)
+    except ValueError:
+        raise ApiError(400, f"invalid {name}: {params[name]!r}")
+    if choices is not None and value not in choices:
+        raise ApiError(400, f"{name} must be one of {', '.join(map(str, choices))}")
+    return value
+
+
+def _limit(params, default=DEFAULT_ROW_LIMIT):
+    limit = _param(params, 'limit', default, int)
+    if not 0 < limit <= MAX_ROW_LIMIT:
+        raise ApiError(400, f"limit must be between 1 and {MAX_ROW_LIMIT}")
+    return limit
+
+
+def _team(data, params, teams=None):
+    team = _param(params, 'team')
+    if team is not None and team not in (teams or data.teams):
+        raise ApiError(404, f"unknown team {team!r}")
+    return team
+
+
+def _pitch_type(data, value):
+    if value is not None and value not in data.pitch_types:
+        raise ApiError(404, f"unknown pitch type {value!r}")
+    return value
+
+
+def _pitcher_summary(data, pid):
+    pitcher = data.pitcher(pid)
+    return {'id': pid, 'name': str(pitcher['Pitcher']), 'team': str(pitcher['PitcherTeam'])}
+
+
+# ==================== Endpoints ====================
+def get_teams(data, params, tail):
+    return {'teams': list(data.teams)}
+
+
+def get_rankings(data, params, tail):
+    team = _team(data, params)
+    pitch_type = _pitch_type(data, _param(params, 'pitch_type'))
+    metric = _param(params, 'metric', 'Pitching+', str, list(OVERALL_METRICS))
+    min_pitches = _param(params, 'min_pitches', 0, int)
+    limit = _limit(params)
+
+    ranked = data.rankings.ranked(team, pitch_type, metric, min_pitches)
+    rows = _records(ranked.iloc[:limit])
+    for rank, row in enumerate(rows, start=1):
+        row['Rank'] = rank
+    return {
+        'team': team, 'pitch_type': pitch_type, 'metric': metric, 'min_pitches': min_pitches,
+        'total': len(ranked), 'rows': rows
+    }
+
+
+def get_pitchers(data, params, tail):
+    """Pitcher search, or a team's pitchers when no query is given"""
+    team = _team(data, params)
+    limit = _limit(params, 20)
+    query = _param(params, 'q', '')
+    pids = data.search.search(query, team, limit) if query else data.pitchers(team)[:limit]
+    return {'pitchers': [_pitcher_summary(data, pid) for pid in pids]}
+
+
+def get_pitcher(data, params, tail):
+    pid = unquote(tail)
+    pitcher = data.pitcher(pid)
+    if pitcher is None:
+        raise ApiError(404, f"unknown pitcher {pid!r}")
+    similar = _param(params, 'similar', 0, int)
+    if not 0 <= similar <= 50:
+        raise ApiError(400, "similar must be between 0 and 50")
+
+    pitch_types = _records(data.pitcher_pitch_types(pid))
+    percentiles = _records(data.pitcher_percentiles(pid))
+    for row, row_percentiles in zip(pitch_types, percentiles):
+        row['Percentiles'] = row_percentiles
+    profile = {
+        **_pitcher_summary(data, pid),
+        'overall': {col: _value(value) for col, value in pitcher.items()},
+        'pitch_types': pitch_types
+    }
+    if similar:
+        profile['similar_arsenals'] = _records(data.similar_arsenals(pid, similar))
+    return profile
+
+
+def get_pitch_types(data, params, tail):
+    """Pitch type list, or one pitch type's rows when the path names one"""
+    if not tail:
+        return {'pitch_types': list(data.pitch_types)}
+    pitch_type = _pitch_type(data, unquote(tail))
+    team = _team(data, params, data.pitch_type_teams)
+    min_pitches = _param(params, 'min_pitches', 0, int)
+    limit = _limit(params)
+
+    rows = data.qualified_pitch_types(team, pitch_type, min_pitches)
+    metrics = ['StuffPlus', 'PitchingPlus', 'Avg_Velocity']
+    return {
+        'pitch_type': pitch_type, 'team': team, 'min_pitches': min_pitches, 'total': len(rows),
+        'averages': {col: _value(rows[col].mean()) for col in metrics},
+        'rows': _records(rows.iloc[:limit])
+    }
+
+
+# Path -> handler, and path prefix -> handler taking the rest of the path
+ROUTES = {
+    '/teams': get_teams,
+    '/rankings': get_rankings,
+    '/pitchers': get_pitchers,
+    '/pitch-types': get_pitch_types
+}
+PREFIX_ROUTES = {
+    '/pitchers/': get_pitcher,
+    '/pitch-types/': get_pitch_types
+}
+
+
+def _route(path):
+    handler = ROUTES.get(path.rstrip('/') or '/')
+    if handler is not None:
+        return handler, ''
+    for prefix, handler in PREFIX_ROUTES.items():
+        if path.startswith(prefix):
+            return handler, path[len(prefix):]
+    raise ApiError(404, f"no endpoint at {path}")
+
+
+class ResponseCache:
+    """Bounded LRU of encoded response bodies keyed on dataset version and query"""
+
+    def __init__(self, max_entries=RESPONSE_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def put(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+class PitcherApi:
+    """Turns a request target into (status, headers, body) from the latest dataset"""
+
+    def __init__(self, watcher=None, cache=None):
+        self.watcher = watcher or DatasetWatcher()
+        self.cache = cache or ResponseCache()
+        self.data = None
+        self.refresh()
+
+    def refresh(self):
+        """Pick up a reloaded dataset with its indexes built; blocking, so serve() runs it in a thread"""
+        data = self.watcher.current()
+        if data is not self.data:
+            data.build_indexes()
+            self.data = data
+        return data
+
+    def respond(self, target, if_none_match=None):
+        url = urlsplit(target)
+        path = url.path or '/'
+        params = dict(parse_qsl(url.query, keep_blank_values=True))
+        data = self.data
+
+        # The same request against the same dataset version always has the same body
+        key = (data.version, path, tuple(sorted(params.items())))
+        etag = '"' + hashlib.sha1(repr(key).encode()).hexdigest()[:20] + '"'
+        headers = {'ETag': etag, 'Cache-Control': 'no-cache'}
+        if if_none_match is not None and etag in [tag.strip() for tag in if_none_match.split(',')]:
+            return 304, headers, b''
+
+        body = self.cache.get(key)
+        if body is None:
+            try:
+                handler, tail = _route(path)
+                body = json.dumps(handler(data, params, tail), separators=(',', ':')).encode()
+            except ApiError as e:
+                return e.status, {}, json.dumps({'error': str(e)}).encode()
+            self.cache.put(key, body)
+        return 200, headers, body
+
+
+async def _read_request(reader):
+    """Request line and headers, or None when the client closed the connection"""
+    try:
+        head = await asyncio.wait_for(reader.readuntil(b'\r\n\r\n'), KEEP_ALIVE_TIMEOUT)
+    except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+        return None
+    except asyncio.LimitOverrunError:
+        raise ApiError(431, "request headers too large")
+
+    lines = head.decode('latin-1').split('\r\n')
+    try:
+        method, target, version = lines[0].split(' ')
+    except ValueError:
+        raise ApiError(400, "malformed request line")
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(':')
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    return method, target, version, headers
+
+
+def _encode_response(status, headers, body, keep_alive, send_body=True):
+    lines = [f"HTTP/1.1 {status} {STATUS_TEXT.get(status, '')}"]
+    headers = {
+        'Content-Type': 'application/json',
+        'Content-Length': str(len(body)),
+        'Connection': 'keep-alive' if keep_alive else 'close',
+        **headers
+    }
+    lines.extend(f"{name}: {value}" for name, value in headers.items())
+    head = ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+    return head + body if send_body and status != 304 else head
+
+
+async def handle_connection(api, reader, writer):
+    """Serve requests on one connection until the client or a timeout closes it"""
+    try:
+        while True:
+            keep_alive = False
+            try:
+                request = await _read_request(reader)
+                if request is None:
+                    break
+                method, target, version, headers = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                if headers.get('content-length', '0') != '0' or 'transfer-encoding' in headers:
+                    # Request bodies are never read, so close rather than parse the body as the next request
+                    keep_alive = False
+                if method not in ('GET', 'HEAD'):
+                    keep_alive = False
+                    raise ApiError(405, f"{method} is not supported")
+                status, response_headers, body = api.respond(target, headers.get('if-none-match'))
+            except ApiError as e:
+                status, response_headers, body = e.status, {}, json.dumps({'error': str(e)}).encode()
+                method = 'GET'
+            except Exception:
+                status, response_headers, body = 500, {}, json.dumps({'error': "internal error"}).encode()
+                method, keep_alive = 'GET', False
+
+            writer.write(_encode_response(status, response_headers, body, keep_alive, method != 'HEAD'))
+            await writer.drain()
+            if not keep_alive:
+                break
+    except ConnectionError:
+        pass
+    finally:
+        writer.close()
+
+
+async def refresh_periodically(api):
+    """Check for changed CSVs every watcher interval, reloading in a worker thread"""
+    loop = asyncio.get_running_loop()
+    while True:
+        await asyncio.sleep(api.watcher.interval)
+        try:
+            await loop.run_in_executor(None, api.refresh)
+        except Exception:
+            logger.exception("Dataset refresh failed; still serving version %s", api.data.version)
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT, api=None):
+    api = api or PitcherApi()
+    server = await asyncio.start_server(
+        lambda reader, writer: handle_connection(api, reader, writer), host, port, limit=MAX_HEADER_BYTES
+    )
+    refresher = asyncio.create_task(refresh_periodically(api))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        refresher.cancel()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the pitcher summary tables as JSON")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Interface to bind")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    args = parser.parse_args()
+
+    api = PitcherApi()
+    print(f"Serving pitcher data version {api.data.version} on http://{args.host}:{args.port}")
+    try:
+        asyncio.run(serve(args.host, args.port, api))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""Batch jobs over the pitcher summary tables.
+
+Reads the same PitcherDataset as the dashboard without importing Streamlit or
+Plotly. The dataset's lookups are built lazily, so an export only loads the
+tables and sorts the one leaderboard it writes; importing pandas is most of
+the run time.
+
+Usage:
+    python pitcher_cli.py rankings --team TEAM --pitch-type Slider --min-pitches 50 --out sliders.parquet
+    python pitcher_cli.py rankings --metric Stuff+ --all-pitch-types --out rankings.zip
+    python pitcher_cli.py teams
+    python pitcher_cli.py pitch-types
+"""
+import argparse
+import os
+import sys
+
+from pitcher_data import EXPORT_FORMATS, OVERALL_METRICS, frame_bytes, load_dataset, zip_frames
+
+
+def _export_format(args):
+    """Explicit --format, else the one matching the output file extension, else CSV"""
+    if args.format:
+        return args.format
+    extension = os.path.splitext(args.out or '')[1].lstrip('.').lower()
+    for export_format, (format_extension, _) in EXPORT_FORMATS.items():
+        if extension == format_extension:
+            return export_format
+    return 'CSV'
+
+
+def _write(payload, out):
+    if out is None:
+        sys.stdout.buffer.write(payload)
+        return
+    # Replace atomically so readers never pick up a half-written file
+    with open(out + '.tmp', 'wb') as f:
+        f.write(payload)
+    os.replace(out + '.tmp', out)
+
+
+def rankings(args):
+    data = load_dataset()
+    if args.team is not None and args.team not in data.teams:
+        args.parser.error(f"unknown team {args.team!r}; run 'teams' for the list")
+    if args.pitch_type is not None and args.pitch_type not in data.pitch_types:
+        args.parser.error(f"unknown pitch type {args.pitch_type!r}; run 'pitch-types' for the list")
+    if args.all_pitch_types and args.pitch_type is not None:
+        args.parser.error("--all-pitch-types and --pitch-type are mutually exclusive")
+
+    export_format = _export_format(args)
+    if args.all_pitch_types:
+        metric_name = args.metric.lower().replace('+', 'plus')
+        leaderboards = data.pitch_type_leaderboards(args.team, args.metric, args.min_pitches)
+        frames = {
+            f"{pitch_type}_rankings_{metric_name}": ranked.head(args.limit) if args.limit else ranked
+            for pitch_type, ranked in leaderboards.items()
+        }
+        payload = zip_frames(frames, export_format)
+        rows = sum(len(ranked) for ranked in frames.values())
+    else:
+        ranked = data.rankings.ranked(args.team, args.pitch_type, args.metric, args.min_pitches)
+        if args.limit:
+            ranked = ranked.head(args.limit)
+        payload = frame_bytes(ranked, export_format)
+        rows = len(ranked)
+
+    _write(payload, args.out)
+    if args.out is not None:
+        print(f"Wrote {rows:,} ranked rows to {args.out}")
+
+
+def list_values(values):
+    def run(args):
+        print('\n'.join(values(load_dataset())))
+    return run
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch jobs over the pitcher summary tables")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    ranking_parser = commands.add_parser('rankings', help="Export a leaderboard")
+    ranking_parser.add_argument('--team', help="Team to rank (default: all teams)")
+    ranking_parser.add_argument('--pitch-type', help="Rank one pitch type instead of overall performance")
+    ranking_parser.add_argument('--all-pitch-types', action='store_true',
+                                help="Zip one leaderboard per pitch type")
+    ranking_parser.add_argument('--metric', choices=list(OVERALL_METRICS), default='Pitching+', help="Sort metric")
+    ranking_parser.add_argument('--min-pitches', type=int, default=0, help="Minimum pitches thrown")
+    ranking_parser.add_argument('--limit', type=int, help="Keep only the top N rows")
+    ranking_parser.add_argument('--format', choices=list(EXPORT_FORMATS),
+                                help="Output format (default: from --out's extension, else CSV)")
+    ranking_parser.add_argument('--out', help="Output file (default: stdout)")
+    ranking_parser.set_defaults(run=rankings, parser=ranking_parser)
+
+    commands.add_parser('teams', help="List teams").set_defaults(run=list_values(lambda data: data.teams))
+    commands.add_parser('pitch-types', help="List pitch types").set_defaults(
+        run=list_values(lambda data: data.pitch_types)
+    )
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,6 @@
+import json
+import os
+
 import streamlit as st
 import pandas as pd
 import plotly.express as px
@@ -5,6 +8,36 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 import numpy as np
 
+from figure_cache import FigureCache
+from location_density import bin_locations
+from pitch_store import (
+    PITCH_STORE_DIR,
+    RAW_PITCH_FILE,
+    STORE_META_FILE,
+    file_signature,
+    has_raw_columns,
+    load_location_grids,
+    load_location_summary,
+    location_grids,
+    location_lookup,
+    pitcher_id,
+    read_raw_pitches,
+    store_is_current,
+    summarize_locations
+)
+from pitcher_data import EXPORT_FORMATS, DatasetWatcher, frame_bytes, zip_frames
+from pitcher_figures import (
+    create_density_plot,
+    create_distribution_plot,
+    create_location_heatmap,
+    create_movement_plot,
+    create_percentile_plot,
+    create_performance_matrix,
+    create_strike_zone_plot,
+    plotly_template,
+    scatter_render_mode
+)
+
 # Set page config
 st.set_page_config(
     page_title="Pitcher Analytics Dashboard",
@@ -91,18 +124,21 @@ st.markdown("""
         color: #e0e0e0 !important;
     }
     
-    /* Tabs */
-    .stTabs [data-baseweb="tab-list"] {
-        gap: 16px;
+    /* View navigation */
+    .st-key-active_view > div {
         background: linear-gradient(135deg, #1a1d24 0%, #1f2229 100%);
         padding: 20px 24px;
         border-radius: 16px;
+        border: none;
         margin-bottom: 40px;
         box-shadow: 0 8px 24px rgba(0, 0, 0, 0.4);
     }
     
-    .stTabs [data-baseweb="tab"] {
-        background-color: transparent;
+    .st-key-active_view [role="radiogroup"] {
+        gap: 16px;
+    }
+    
+    .st-key-active_view [role="radiogroup"] > label {
         color: #888;
         border-radius: 10px;
         padding: 14px 28px;
@@ -112,15 +148,13 @@ st.markdown("""
         transition: all 0.3s ease;
     }
     
-    .stTabs [data-baseweb="tab"]:hover {
+    .st-key-active_view [role="radiogroup"] > label:hover {
         background-color: rgba(255, 255, 255, 0.05);
-        color: #aaa;
         border-color: #444;
     }
     
-    .stTabs [aria-selected="true"] {
+    .st-key-active_view [role="radiogroup"] > label:has(input:checked) {
         background: linear-gradient(135deg, #ff4b4b 0%, #ff3333 100%);
-        color: #ffffff !important;
         border-color: #ff4b4b;
         box-shadow: 0 4px 16px rgba(255, 75, 75, 0.3);
     }
@@ -245,28 +279,6 @@ st.markdown("""
     </style>
     """, unsafe_allow_html=True)
 
-# Plotly theme configuration
-plotly_template = {
-    'layout': {
-        'paper_bgcolor': '#1a1d24',
-        'plot_bgcolor': '#1a1d24',
-        'font': {'color': '#e0e0e0', 'family': 'Inter, sans-serif'},
-        'xaxis': {
-            'gridcolor': '#333',
-            'linecolor': '#444',
-            'zerolinecolor': '#444'
-        },
-        'yaxis': {
-            'gridcolor': '#333',
-            'linecolor': '#444',
-            'zerolinecolor': '#444'
-        },
-        'title': {
-            'font': {'size': 18, 'color': '#ffffff'}
-        }
-    }
-}
-
 # Helper function to format numbers without trailing zeros
 def format_number(value, decimals=1):
     """Format number to remove trailing zeros"""
@@ -279,205 +291,149 @@ def format_number(value, decimals=1):
     formatted = formatted.rstrip('0').rstrip('.')
     return formatted
 
-# Helper function to create movement plot
-def create_movement_plot(pitch_data, title="Pitch Movement"):
-    """Create pitch movement plot showing break patterns"""
-    fig = go.Figure()
-    
-    # Color map for pitch types
-    color_map = {
-        'Fastball': '#FF6B6B',
-        'FourSeamFastBall': '#FF6B6B',
-        'TwoSeamFastBall': '#FF8C8C',
-        'Sinker': '#FFA07A',
-        'Cutter': '#FFD93D',
-        'Slider': '#6BCF7F',
-        'Curveball': '#4ECDC4',
-        'ChangeUp': '#95E1D3',
-        'Splitter': '#A8E6CF'
-    }
-    
-    for _, pitch in pitch_data.iterrows():
-        color = color_map.get(pitch['TaggedPitchType'], '#CCCCCC')
-        
-        # Calculate size - much smaller now, max 25 pixels
-        size = min(8 + (pitch['Pitch_Count'] / 50), 25)
-        
-        fig.add_trace(go.Scatter(
-            x=[pitch['Avg_HorzBreak']],
-            y=[pitch['Avg_InducedVert']],
-            mode='markers+text',
-            name=pitch['TaggedPitchType'],
-            marker=dict(
-                size=size,
-                color=color,
-                line=dict(color='white', width=2)
-            ),
-            text=pitch['TaggedPitchType'],
-            textposition='top center',
-            textfont=dict(size=10, color='white'),
-            hovertemplate=(
-                f"<b>{pitch['TaggedPitchType']}</b><br>" +
-                f"Horizontal: {format_number(pitch['Avg_HorzBreak'])}″<br>" +
-                f"Vertical: {format_number(pitch['Avg_InducedVert'])}″<br>" +
-                f"Count: {int(pitch['Pitch_Count'])}<br>" +
-                "<extra></extra>"
-            )
-        ))
-    
-    # Add quadrant lines
-    fig.add_hline(y=0, line_dash="dash", line_color="#666", opacity=0.5)
-    fig.add_vline(x=0, line_dash="dash", line_color="#666", opacity=0.5)
-    
-    fig.update_layout(
-        title=f"<b>{title}</b>",
-        xaxis_title="Horizontal Break (inches)",
-        yaxis_title="Induced Vertical Break (inches)",
-        template=plotly_template,
-        showlegend=False,
-        height=500,
-        xaxis=dict(range=[-25, 25], zeroline=True),
-        yaxis=dict(range=[-25, 25], zeroline=True)
-    )
-    
-    return fig
+# Vectorized versions of format_number for whole columns
+def format_column(values, decimals=1):
+    """Format a column of numbers as strings without trailing zeros"""
+    values = np.asarray(values, dtype='float64')
+    missing = np.isnan(values)
+    if decimals == 0:
+        formatted = np.char.mod('%d', np.trunc(np.where(missing, 0, values)))
+    else:
+        formatted = np.char.rstrip(np.char.rstrip(np.char.mod(f'%.{decimals}f', values), '0'), '.')
+    return np.where(missing, '', formatted)
 
-# Helper function to create strike zone plot
-def create_strike_zone_plot(pitch_data, title="Pitch Location"):
-    """Create strike zone heat map"""
-    
-    # Check if we have location data
-    if 'PlateLocSide' not in pitch_data.columns or 'PlateLocHeight' not in pitch_data.columns:
-        # Return empty plot with message
-        fig = go.Figure()
-        fig.add_annotation(
-            text="Location data not available",
-            xref="paper", yref="paper",
-            x=0.5, y=0.5, showarrow=False,
-            font=dict(size=16, color="#888")
-        )
-        fig.update_layout(
-            template=plotly_template,
-            height=500,
-            xaxis=dict(visible=False),
-            yaxis=dict(visible=False)
-        )
-        return fig
-    
-    fig = go.Figure()
-    
-    # Color map for pitch types
-    color_map = {
-        'Fastball': '#FF6B6B',
-        'FourSeamFastBall': '#FF6B6B',
-        'TwoSeamFastBall': '#FF8C8C',
-        'Sinker': '#FFA07A',
-        'Cutter': '#FFD93D',
-        'Slider': '#6BCF7F',
-        'Curveball': '#4ECDC4',
-        'ChangeUp': '#95E1D3',
-        'Splitter': '#A8E6CF'
-    }
-    
-    # Plot each pitch type - NO FLIPPING, use data as-is
-    for _, pitch in pitch_data.iterrows():
-        if pd.notna(pitch.get('PlateLocSide')) and pd.notna(pitch.get('PlateLocHeight')):
-            color = color_map.get(pitch['TaggedPitchType'], '#CCCCCC')
-            
-            # Much smaller bubbles - max 20 pixels
-            size = min(6 + (pitch['Pitch_Count'] / 60), 20)
-            
-            fig.add_trace(go.Scatter(
-                x=[pitch['PlateLocSide']],
-                y=[pitch['PlateLocHeight']],
-                mode='markers',
-                name=pitch['TaggedPitchType'],
-                marker=dict(
-                    size=size,
-                    color=color,
-                    opacity=0.7,
-                    line=dict(color='white', width=1)
-                ),
-                hovertemplate=(
-                    f"<b>{pitch['TaggedPitchType']}</b><br>" +
-                    f"Horizontal: {format_number(pitch['PlateLocSide'], 2)}<br>" +
-                    f"Height: {format_number(pitch['PlateLocHeight'], 2)}<br>" +
-                    f"Count: {int(pitch['Pitch_Count'])}<br>" +
-                    "<extra></extra>"
-                )
-            ))
-    
-    # Draw strike zone (approximate MLB strike zone)
-    strike_zone_x = [-0.83, 0.83, 0.83, -0.83, -0.83]
-    strike_zone_y = [1.5, 1.5, 3.5, 3.5, 1.5]
-    
-    fig.add_trace(go.Scatter(
-        x=strike_zone_x,
-        y=strike_zone_y,
-        mode='lines',
-        line=dict(color='white', width=3),
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-    
-    # Add home plate - ROTATED 180° FOR PITCHER'S VIEW
-    # Point of plate facing down/away (toward catcher)
-    # Base of plate at top (toward pitcher)
-    plate_x = [0.83, -0.83, -0.83, 0, 0.83]
-    plate_y = [-0.15, -0.15, 0.0, 0.15, 0.0]
-    
-    fig.add_trace(go.Scatter(
-        x=plate_x,
-        y=plate_y,
-        fill='toself',
-        fillcolor='rgba(255, 255, 255, 0.3)',
-        line=dict(color='white', width=2),
-        showlegend=False,
-        hoverinfo='skip'
-    ))
-    
-    fig.update_layout(
-        title=f"<b>{title}</b>",
-        xaxis_title="Horizontal Location (ft, pitcher's view)",
-        yaxis_title="Height (ft)",
-        template=plotly_template,
-        showlegend=False,
-        height=500,
-        xaxis=dict(range=[-2.5, 2.5], zeroline=False),
-        yaxis=dict(range=[-0.5, 4.5], zeroline=False, scaleanchor="x", scaleratio=1)
-    )
-    
-    return fig
+def round_column(values, decimals=1):
+    """Round a column for display, keeping it numeric so tables sort by value"""
+    values = values.astype('float64')
+    if decimals == 0:
+        return np.trunc(values)
+    return values.round(decimals)
+
+def plain_number_columns(*columns):
+    """Column config that shows rounded numbers as-is, without trailing zeros"""
+    return {col: st.column_config.NumberColumn(format="plain") for col in columns}
 
 # Title
 st.markdown("# ⚾ Pitcher Analytics Dashboard")
 st.markdown("<p class='subtitle'>Advanced Stuff+ and Pitching+ Performance Analysis</p>", unsafe_allow_html=True)
 
-# Load data
-@st.cache_data
-def load_data():
+# Figure specs are shared by every session and reused for identical filter states
+@st.cache_resource
+def get_figure_cache():
+    return FigureCache()
+
+figure_cache = get_figure_cache()
+
+# Load data once per server process; every session shares the same read-only frames.
+# The watcher reloads a table when its CSV changes, and figures built from the old
+# version of that table are dropped
+@st.cache_resource
+def get_data_watcher():
+    def drop_stale_figures(previous, dataset):
+        figure_cache.invalidate(
+            version for name, version in previous.table_versions.items()
+            if dataset.table_versions.get(name) != version
+        )
+    
     try:
-        pitch_type_df = pd.read_csv('pitcher_pitch_type_summary_2025.csv')
-        overall_df = pd.read_csv('pitcher_overall_summary_2025.csv')
-        return pitch_type_df, overall_df
+        return DatasetWatcher(on_reload=drop_stale_figures)
     except FileNotFoundError as e:
         st.error(f"Error loading data: {e}")
         st.stop()
 
-pitch_type_df, overall_df = load_data()
+data = get_data_watcher().current()
 
-# Check if we have the raw data with PlateLocSide and PlateLocHeight
-try:
-    raw_data = pd.read_csv('pitching_2025.csv')
-    has_location_data = 'PlateLocSide' in raw_data.columns and 'PlateLocHeight' in raw_data.columns
-except:
-    has_location_data = False
+def ensure_current_data():
+    """Rerun the whole app if the data changed since this script run"""
+    if get_data_watcher().current() is not data:
+        st.rerun()
+
+# Summary tables each view's figures are built from
+VIEW_TABLES = {
+    'overview': ('overall',),
+    'profile': ('pitch_type', 'overall'),
+    'pitch_type': ('pitch_type',)
+}
+
+def figure_key(view, chart, *filters):
+    """Cache key for a figure: view, chart, filter values and the versions of its tables"""
+    return (view, chart) + filters + tuple(data.table_versions[table] for table in VIEW_TABLES[view])
 
-# Main content
-tab1, tab2, tab3, tab4 = st.tabs(["📊 Overview", "👤 Pitcher Profile", "🎯 Pitch Type Analysis", "📈 Rankings"])
+def show_cached_chart(key, build):
+    """Draw a figure from the figure cache, running build() only on a miss"""
+    fig_json = figure_cache.get_or_build(key, build)
+    # The spec was validated when it was built, so skip Plotly's validation here
+    st.plotly_chart(go.Figure(json.loads(fig_json), _validate=False), use_container_width=True)
+
+# Download files are only built when a download button is clicked, then cached per filter state
+@st.cache_data(max_entries=32, show_spinner=False)
+def ranking_export(_dataset, version, team, pitch_type, metric, min_pitches, export_format):
+    """File bytes for one leaderboard"""
+    return frame_bytes(_dataset.rankings.ranked(team, pitch_type, metric, min_pitches), export_format)
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def pitch_type_rankings_export(_dataset, version, team, metric, min_pitches, export_format):
+    """Zip with one leaderboard file per pitch type"""
+    metric_name = metric.lower().replace('+', 'plus')
+    leaderboards = _dataset.pitch_type_leaderboards(team, metric, min_pitches)
+    return zip_frames(
+        {f"{pitch_type}_rankings_{metric_name}": ranked for pitch_type, ranked in leaderboards.items()},
+        export_format
+    )
+
+def location_sources():
+    """Size and mtime of the raw file and the store metadata, None where missing"""
+    signatures = []
+    for path in (RAW_PITCH_FILE, os.path.join(PITCH_STORE_DIR, STORE_META_FILE)):
+        try:
+            signatures.append(tuple(file_signature(path).values()))
+        except FileNotFoundError:
+            signatures.append(None)
+    return tuple(signatures)
+
+# Keyed on the source signatures, so a raw file or store added while the app runs is picked up
+@st.cache_data(max_entries=4)
+def check_location_data(sources):
+    """Check for location data in the location store or the raw file header"""
+    return store_ready(sources) or has_raw_columns(RAW_PITCH_FILE)
+
+@st.cache_data(max_entries=4)
+def store_ready(sources):
+    """Whether the precomputed location store is built and current"""
+    return store_is_current(PITCH_STORE_DIR, RAW_PITCH_FILE)
+
+@st.cache_resource(max_entries=1)
+def load_location_lookup(sources):
+    """Per-pitcher location summaries, built at ingest or once from the raw file"""
+    summary = None
+    if store_ready(sources):
+        try:
+            summary = load_location_summary(PITCH_STORE_DIR)
+        except FileNotFoundError:
+            pass
+    if summary is None:
+        # Read here rather than cached, so the raw season is freed once it is summarized
+        summary = summarize_locations(read_raw_pitches(RAW_PITCH_FILE))
+    return location_lookup(summary)
+
+@st.cache_resource(max_entries=1)
+def load_density_grids(sources):
+    """Per-pitcher and league location grids, built at ingest or once from the raw file"""
+    if store_ready(sources):
+        try:
+            return load_location_grids(PITCH_STORE_DIR)
+        except FileNotFoundError:
+            pass
+    return location_grids(bin_locations(read_raw_pitches(RAW_PITCH_FILE)))
+
+# Check if we have the raw data with PlateLocSide and PlateLocHeight
+location_source_signatures = location_sources()
+has_location_data = check_location_data(location_source_signatures)
 
 # ==================== TAB 1: OVERVIEW ====================
-with tab1:
+@st.fragment
+def render_overview():
+    ensure_current_data()
     st.markdown("## League Overview")
     
     # Filters for Overview
@@ -485,7 +441,7 @@ with tab1:
     col1, col2 = st.columns(2)
     
     with col1:
-        teams_overview = ['All Teams'] + sorted(overall_df['PitcherTeam'].unique().tolist())
+        teams_overview = ['All Teams'] + list(data.teams)
         selected_team_overview = st.selectbox("Team Filter", teams_overview, key="overview_team")
     
     with col2:
@@ -493,7 +449,6 @@ with tab1:
             "Minimum Pitches",
             min_value=0,
             max_value=500,
-            value=50,
             step=10,
             key="overview_min_pitches"
         )
@@ -501,12 +456,8 @@ with tab1:
     st.markdown("</div>", unsafe_allow_html=True)
     
     # Apply filters
-    if selected_team_overview != 'All Teams':
-        overview_filtered = overall_df[overall_df['PitcherTeam'] == selected_team_overview]
-    else:
-        overview_filtered = overall_df.copy()
-    
-    overview_filtered = overview_filtered[overview_filtered['Total_Pitches'] >= min_pitches_overview]
+    overview_team = None if selected_team_overview == 'All Teams' else selected_team_overview
+    overview_filtered = data.qualified_overall(overview_team, min_pitches_overview)
     
     # Key Metrics
     col1, col2, col3, col4 = st.columns(4)
@@ -540,61 +491,67 @@ with tab1:
     
     st.markdown("---")
     
-    # Distribution plots
+    # Distribution plots - bins are counted server-side on the qualified league's edges
+    show_league_overlay = overview_team is not None and st.checkbox(
+        "Overlay league distribution",
+        key="overview_league_overlay"
+    )
+    
+    def metric_distribution(metric, color):
+        league_counts = None
+        if show_league_overlay:
+            league_counts = data.metric_histogram(metric, None, min_pitches_overview)
+        return create_distribution_plot(
+            data.metric_histogram(metric, overview_team, min_pitches_overview),
+            data.distribution_edges(metric, min_pitches_overview),
+            f"{metric} Distribution",
+            metric,
+            color,
+            league_counts
+        )
+    
     col1, col2 = st.columns(2)
     
     with col1:
-        fig_pitching = px.histogram(
-            overview_filtered,
-            x='Overall_PitchingPlus',
-            nbins=30,
-            title="<b>Pitching+ Distribution</b>",
-            labels={'Overall_PitchingPlus': 'Pitching+'},
-            color_discrete_sequence=['#636EFA']
+        def build_pitching_distribution():
+            fig_pitching = metric_distribution('Pitching+', '#636EFA')
+            fig_pitching.add_vline(x=100, line_dash="dash", line_color="#ff4b4b", 
+                                   annotation_text="League Avg", annotation_position="top")
+            fig_pitching.update_layout(template=plotly_template, height=400)
+            return fig_pitching
+        
+        show_cached_chart(
+            figure_key('overview', 'pitching_distribution', selected_team_overview, min_pitches_overview, show_league_overlay),
+            build_pitching_distribution
         )
-        fig_pitching.add_vline(x=100, line_dash="dash", line_color="#ff4b4b", 
-                               annotation_text="League Avg", annotation_position="top")
-        fig_pitching.update_layout(template=plotly_template, height=400)
-        st.plotly_chart(fig_pitching, use_container_width=True)
     
     with col2:
-        fig_stuff = px.histogram(
-            overview_filtered,
-            x='Overall_StuffPlus',
-            nbins=30,
-            title="<b>Stuff+ Distribution</b>",
-            labels={'Overall_StuffPlus': 'Stuff+'},
-            color_discrete_sequence=['#EF553B']
+        def build_stuff_distribution():
+            fig_stuff = metric_distribution('Stuff+', '#EF553B')
+            fig_stuff.add_vline(x=100, line_dash="dash", line_color="#ff4b4b", 
+                               annotation_text="League Avg", annotation_position="top")
+            fig_stuff.update_layout(template=plotly_template, height=400)
+            return fig_stuff
+        
+        show_cached_chart(
+            figure_key('overview', 'stuff_distribution', selected_team_overview, min_pitches_overview, show_league_overlay),
+            build_stuff_distribution
         )
-        fig_stuff.add_vline(x=100, line_dash="dash", line_color="#ff4b4b", 
-                           annotation_text="League Avg", annotation_position="top")
-        fig_stuff.update_layout(template=plotly_template, height=400)
-        st.plotly_chart(fig_stuff, use_container_width=True)
     
     # Scatter plot
     st.markdown("## Performance Matrix")
     
-    fig_scatter = px.scatter(
-        overview_filtered,
-        x='Overall_StuffPlus',
-        y='Overall_PitchingPlus',
-        hover_data=['Pitcher', 'PitcherTeam', 'Total_Pitches'],
-        size='Total_Pitches',
-        color='Total_Pitches',
-        title="<b>Stuff+ vs Pitching+</b>",
-        labels={
-            'Overall_StuffPlus': 'Stuff+',
-            'Overall_PitchingPlus': 'Pitching+',
-            'Total_Pitches': 'Pitches'
-        },
-        color_continuous_scale='Plasma'
-    )
+    matrix_mode = scatter_render_mode(len(overview_filtered))
+    if matrix_mode == 'density':
+        st.caption(f"Showing pitcher density for {len(overview_filtered):,} pitchers")
     
-    fig_scatter.add_hline(y=100, line_dash="dash", line_color="#666", opacity=0.5)
-    fig_scatter.add_vline(x=100, line_dash="dash", line_color="#666", opacity=0.5)
-    fig_scatter.update_layout(template=plotly_template, height=600)
+    def build_performance_matrix():
+        return create_performance_matrix(overview_filtered, matrix_mode)
     
-    st.plotly_chart(fig_scatter, use_container_width=True)
+    show_cached_chart(
+        figure_key('overview', 'performance_matrix', selected_team_overview, min_pitches_overview),
+        build_performance_matrix
+    )
     
     # Top performers tables
     st.markdown("## Top Performers")
@@ -603,30 +560,150 @@ with tab1:
     
     with col1:
         st.markdown("### 🏆 Top 10 by Pitching+")
-        top_pitching = overview_filtered.nlargest(10, 'Overall_PitchingPlus')[
+        top_pitching = data.rankings.top(overview_team, None, 'Pitching+', min_pitches_overview)[
             ['Pitcher', 'PitcherTeam', 'Overall_PitchingPlus', 'Total_Pitches']
         ].copy()
         
-        top_pitching['Overall_PitchingPlus'] = top_pitching['Overall_PitchingPlus'].apply(lambda x: format_number(x, 1))
+        top_pitching['Overall_PitchingPlus'] = round_column(top_pitching['Overall_PitchingPlus'], 1)
         top_pitching['Total_Pitches'] = top_pitching['Total_Pitches'].astype(int)
         top_pitching.index = range(1, len(top_pitching) + 1)
         
-        st.dataframe(top_pitching, use_container_width=True, height=400)
+        st.dataframe(
+            top_pitching,
+            use_container_width=True,
+            height=400,
+            column_config=plain_number_columns('Overall_PitchingPlus')
+        )
     
     with col2:
         st.markdown("### 🏆 Top 10 by Stuff+")
-        top_stuff = overview_filtered.nlargest(10, 'Overall_StuffPlus')[
+        top_stuff = data.rankings.top(overview_team, None, 'Stuff+', min_pitches_overview)[
             ['Pitcher', 'PitcherTeam', 'Overall_StuffPlus', 'Total_Pitches']
         ].copy()
         
-        top_stuff['Overall_StuffPlus'] = top_stuff['Overall_StuffPlus'].apply(lambda x: format_number(x, 1))
+        top_stuff['Overall_StuffPlus'] = round_column(top_stuff['Overall_StuffPlus'], 1)
         top_stuff['Total_Pitches'] = top_stuff['Total_Pitches'].astype(int)
         top_stuff.index = range(1, len(top_stuff) + 1)
         
-        st.dataframe(top_stuff, use_container_width=True, height=400)
+        st.dataframe(
+            top_stuff,
+            use_container_width=True,
+            height=400,
+            column_config=plain_number_columns('Overall_StuffPlus')
+        )
+
+# Strike zone panel - its view toggles rerun only this fragment
+@st.fragment
+def render_location_panel(pid, pitch_types):
+    """Draw average locations or density heat maps for one pitcher"""
+    if has_location_data:
+        location_view = st.radio(
+            "Location View",
+            ["Average", "Heat Map", "vs League"],
+            horizontal=True,
+            key="profile_location_view"
+        )
+        
+        if location_view == "Average":
+            # Location summaries are precomputed per pitcher and pitch type
+            location_df = load_location_lookup(location_source_signatures).get(pid)
+            if location_df is not None:
+                location_df = location_df[location_df['TaggedPitchType'].isin(pitch_types)]
+            
+            if location_df is not None and len(location_df) > 0:
+                zone_fig = create_strike_zone_plot(location_df, "Average Pitch Location")
+                st.plotly_chart(zone_fig, use_container_width=True)
+            else:
+                st.info("Location data not available for this pitcher")
+        else:
+            # Density grids are precomputed; only the selected pitch types are summed here
+            heatmap_pitch = st.selectbox(
+                "Heat Map Pitch Type",
+                ['All Pitches'] + pitch_types,
+                key="profile_heatmap_pitch"
+            )
+            if heatmap_pitch == 'All Pitches':
+                heatmap_types = pitch_types
+            else:
+                heatmap_types = [heatmap_pitch]
+            
+            grids = load_density_grids(location_source_signatures)
+            pitcher_grid = grids.pitcher_grid(pid, heatmap_types, sigma=1)
+            league_grid = grids.league_grid(heatmap_types, sigma=1) if location_view == "vs League" else None
+            
+            if pitcher_grid is not None and pitcher_grid.sum() > 0:
+                zone_fig = create_location_heatmap(
+                    pitcher_grid,
+                    "Location vs League" if league_grid is not None else "Pitch Location Density",
+                    league_grid=league_grid
+                )
+                st.plotly_chart(zone_fig, use_container_width=True)
+            else:
+                st.info("Location data not available for this pitcher")
+    else:
+        st.info("Location data not available in dataset")
 
 # ==================== TAB 2: PITCHER PROFILE ====================
-with tab2:
+# Similar pitches panel - its controls rerun only this fragment
+@st.fragment
+def render_similar_pitches(pid, pitch_types):
+    """Table of other pitchers' pitches shaped most like one of this pitcher's"""
+    col1, col2 = st.columns([2, 1])
+    
+    with col1:
+        similar_pitch = st.selectbox(
+            "Compare Pitch",
+            pitch_types,
+            key="profile_similar_pitch"
+        )
+    
+    with col2:
+        same_type_only = st.checkbox(
+            "Same pitch type only",
+            key="profile_similar_same_type"
+        )
+    
+    comps = data.similar_pitches(pid, similar_pitch, k=10, same_type=same_type_only)
+    if len(comps) == 0:
+        st.info("Not enough shape data to find comps for this pitch")
+        return
+    
+    formatted_comps = pd.DataFrame()
+    formatted_comps['Pitcher'] = comps['Pitcher']
+    formatted_comps['Team'] = comps['PitcherTeam']
+    formatted_comps['Pitch Type'] = comps['TaggedPitchType']
+    formatted_comps['Count'] = comps['Pitch_Count'].astype(int)
+    formatted_comps['Velo'] = round_column(comps['Avg_Velocity'], 1)
+    formatted_comps['IVB'] = round_column(comps['Avg_InducedVert'], 1)
+    formatted_comps['HB'] = round_column(comps['Avg_HorzBreak'], 1)
+    formatted_comps['Spin'] = round_column(comps['Avg_SpinRate'], 0)
+    formatted_comps['Ext'] = round_column(comps['Avg_Extension'], 1)
+    formatted_comps['Stuff+'] = round_column(comps['StuffPlus'], 1)
+    formatted_comps['Distance'] = round_column(comps['Distance'], 2)
+    formatted_comps.index = range(1, len(formatted_comps) + 1)
+    
+    st.dataframe(
+        formatted_comps,
+        use_container_width=True,
+        column_config=plain_number_columns('Velo', 'IVB', 'HB', 'Spin', 'Ext', 'Stuff+', 'Distance')
+    )
+    st.caption("Distance in standard deviations across velocity, movement, spin, extension and release point; "
+               "horizontal values are mirrored so left- and right-handers compare on the arm side")
+
+def pitch_mix(pid, n=3):
+    """Short usage summary of a pitcher's most-thrown pitch types"""
+    pitches = data.pitcher_pitch_types(pid)
+    shares = pitches['Pitch_Count'] / max(pitches['Pitch_Count'].sum(), 1) * 100
+    top = shares.nlargest(n)
+    pitch_types = pitches['TaggedPitchType'].astype(str)
+    return ", ".join(f"{pitch_types[i]} {share:.0f}%" for i, share in top.items())
+
+# Most pitcher options sent to the browser at once
+PITCHER_OPTION_LIMIT = 50
+
+@st.fragment
+def render_pitcher_profile():
+    ensure_current_data()
     st.markdown("## Individual Pitcher Analysis")
     
     # Filters for Pitcher Profile
@@ -634,19 +711,39 @@ with tab2:
     col1, col2, col3 = st.columns([2, 2, 1])
     
     with col1:
-        teams_profile = ['All Teams'] + sorted(overall_df['PitcherTeam'].unique().tolist())
+        teams_profile = ['All Teams'] + list(data.teams)
         selected_team_profile = st.selectbox("Filter by Team", teams_profile, key="profile_team")
     
-    # Filter pitcher list by team
-    if selected_team_profile != 'All Teams':
-        available_pitchers = overall_df[overall_df['PitcherTeam'] == selected_team_profile]['Pitcher'].unique()
-    else:
-        available_pitchers = overall_df['Pitcher'].unique()
+    # Pitcher options are pitcher IDs so repeated names stay distinct; searching happens
+    # server-side so only a short list of matches is sent to the browser
+    profile_team = None if selected_team_profile == 'All Teams' else selected_team_profile
     
     with col2:
-        selected_pitcher = st.selectbox(
+        pitcher_query = st.text_input(
+            "Search Pitcher",
+            key="profile_search",
+            placeholder="Type a name..."
+        )
+        if pitcher_query.strip():
+            available_pitchers = data.search.search(pitcher_query, profile_team, limit=PITCHER_OPTION_LIMIT)
+        elif profile_team is not None:
+            available_pitchers = data.pitchers(profile_team)
+        else:
+            available_pitchers = data.busiest_pitchers(PITCHER_OPTION_LIMIT)
+        
+        # Keep the current pitcher selectable while a new search is typed, and drop
+        # it once it no longer fits the team filter
+        current_pitcher = st.session_state.get('profile_pitcher')
+        if current_pitcher is not None and current_pitcher not in available_pitchers:
+            if data.has_pitcher(current_pitcher, profile_team):
+                available_pitchers = [current_pitcher] + available_pitchers
+            else:
+                del st.session_state['profile_pitcher']
+        
+        selected_pitcher_id = st.selectbox(
             "Select Pitcher",
-            sorted(available_pitchers.tolist()),
+            available_pitchers,
+            format_func=lambda pid: data.pitcher_label(pid, with_team=profile_team is None),
             key="profile_pitcher"
         )
     
@@ -655,7 +752,6 @@ with tab2:
             "Min Pitch Count",
             min_value=0,
             max_value=50,
-            value=5,
             step=1,
             key="profile_min_count",
             help="Filter out rarely-used or mis-tagged pitches"
@@ -663,15 +759,15 @@ with tab2:
     
     st.markdown("</div>", unsafe_allow_html=True)
     
-    if selected_pitcher:
+    if not selected_pitcher_id:
+        st.info("No pitchers match that search. Try a different spelling.")
+    else:
         # Get pitcher data
-        pitcher_overall = overall_df[overall_df['Pitcher'] == selected_pitcher].iloc[0]
-        pitcher_pitches = pitch_type_df[pitch_type_df['Pitcher'] == selected_pitcher].copy()
+        pitcher_overall = data.pitcher(selected_pitcher_id)
+        pitcher_pitches = data.pitcher_pitch_types(selected_pitcher_id)
         pitcher_pitches_filtered = pitcher_pitches[pitcher_pitches['Pitch_Count'] >= min_pitch_count]
-        
-        # Get raw pitch data for strike zone if available
-        if has_location_data:
-            pitcher_raw = raw_data[raw_data['Pitcher'] == selected_pitcher].copy()
+        # Precomputed league percentiles share the pitch type table's row labels
+        pitcher_percentiles = data.pitcher_percentiles(selected_pitcher_id).loc[pitcher_pitches_filtered.index]
         
         # Header metrics
         col1, col2, col3, col4, col5 = st.columns(5)
@@ -707,35 +803,17 @@ with tab2:
             
             with col1:
                 # Movement plot
-                movement_fig = create_movement_plot(pitcher_pitches_filtered, "Pitch Movement Profile")
-                st.plotly_chart(movement_fig, use_container_width=True)
+                show_cached_chart(
+                    figure_key('profile', 'movement', selected_pitcher_id, min_pitch_count),
+                    lambda: create_movement_plot(pitcher_pitches_filtered, "Pitch Movement Profile")
+                )
             
             with col2:
                 # Strike zone plot
-                if has_location_data:
-                    # Aggregate location data by pitch type
-                    location_by_pitch = []
-                    for _, pitch in pitcher_pitches_filtered.iterrows():
-                        pitch_type = pitch['TaggedPitchType']
-                        pitch_locs = pitcher_raw[pitcher_raw['TaggedPitchType'] == pitch_type]
-                        if len(pitch_locs) > 0:
-                            avg_side = pitch_locs['PlateLocSide'].mean()
-                            avg_height = pitch_locs['PlateLocHeight'].mean()
-                            location_by_pitch.append({
-                                'TaggedPitchType': pitch_type,
-                                'PlateLocSide': avg_side,
-                                'PlateLocHeight': avg_height,
-                                'Pitch_Count': len(pitch_locs)
-                            })
-                    
-                    if location_by_pitch:
-                        location_df = pd.DataFrame(location_by_pitch)
-                        zone_fig = create_strike_zone_plot(location_df, "Average Pitch Location")
-                        st.plotly_chart(zone_fig, use_container_width=True)
-                    else:
-                        st.info("Location data not available for this pitcher")
-                else:
-                    st.info("Location data not available in dataset")
+                render_location_panel(
+                    selected_pitcher_id,
+                    pitcher_pitches_filtered['TaggedPitchType'].astype(str).tolist()
+                )
             
             st.markdown("---")
             
@@ -746,58 +824,80 @@ with tab2:
             
             with col1:
                 # Pitch type usage
-                fig_usage = px.pie(
-                    pitcher_pitches_filtered,
-                    values='Pitch_Count',
-                    names='TaggedPitchType',
-                    title="<b>Usage Distribution</b>",
-                    hole=0.4,
-                    color_discrete_sequence=px.colors.qualitative.Set3
+                def build_usage():
+                    fig_usage = px.pie(
+                        pitcher_pitches_filtered,
+                        values='Pitch_Count',
+                        names='TaggedPitchType',
+                        title="<b>Usage Distribution</b>",
+                        hole=0.4,
+                        color_discrete_sequence=px.colors.qualitative.Set3
+                    )
+                    fig_usage.update_layout(template=plotly_template, height=400)
+                    fig_usage.update_traces(textposition='inside', textinfo='percent+label')
+                    return fig_usage
+                
+                show_cached_chart(
+                    figure_key('profile', 'usage', selected_pitcher_id, min_pitch_count),
+                    build_usage
                 )
-                fig_usage.update_layout(template=plotly_template, height=400)
-                fig_usage.update_traces(textposition='inside', textinfo='percent+label')
-                st.plotly_chart(fig_usage, use_container_width=True)
             
             with col2:
                 # Pitch metrics comparison
-                fig_metrics = go.Figure()
-                
-                fig_metrics.add_trace(go.Bar(
-                    x=pitcher_pitches_filtered['TaggedPitchType'],
-                    y=pitcher_pitches_filtered['StuffPlus'],
-                    name='Stuff+',
-                    marker_color='#636EFA',
-                    text=pitcher_pitches_filtered['StuffPlus'].apply(lambda x: format_number(x, 1)),
-                    textposition='outside'
-                ))
-                
-                fig_metrics.add_trace(go.Bar(
-                    x=pitcher_pitches_filtered['TaggedPitchType'],
-                    y=pitcher_pitches_filtered['PitchingPlus'],
-                    name='Pitching+',
-                    marker_color='#EF553B',
-                    text=pitcher_pitches_filtered['PitchingPlus'].apply(lambda x: format_number(x, 1)),
-                    textposition='outside'
-                ))
+                def build_ratings():
+                    fig_metrics = go.Figure()
+                    
+                    fig_metrics.add_trace(go.Bar(
+                        x=pitcher_pitches_filtered['TaggedPitchType'],
+                        y=pitcher_pitches_filtered['StuffPlus'],
+                        name='Stuff+',
+                        marker_color='#636EFA',
+                        text=format_column(pitcher_pitches_filtered['StuffPlus'], 1),
+                        textposition='outside'
+                    ))
+                    
+                    fig_metrics.add_trace(go.Bar(
+                        x=pitcher_pitches_filtered['TaggedPitchType'],
+                        y=pitcher_pitches_filtered['PitchingPlus'],
+                        name='Pitching+',
+                        marker_color='#EF553B',
+                        text=format_column(pitcher_pitches_filtered['PitchingPlus'], 1),
+                        textposition='outside'
+                    ))
+                    
+                    fig_metrics.add_hline(
+                        y=100, 
+                        line_dash="dash", 
+                        line_color="#ff4b4b", 
+                        annotation_text="League Avg",
+                        annotation_position="right"
+                    )
+                    
+                    fig_metrics.update_layout(
+                        title="<b>Performance Ratings</b>",
+                        barmode='group',
+                        xaxis_title="Pitch Type",
+                        yaxis_title="Rating",
+                        template=plotly_template,
+                        height=400
+                    )
+                    return fig_metrics
                 
-                fig_metrics.add_hline(
-                    y=100, 
-                    line_dash="dash", 
-                    line_color="#ff4b4b", 
-                    annotation_text="League Avg",
-                    annotation_position="right"
+                show_cached_chart(
+                    figure_key('profile', 'ratings', selected_pitcher_id, min_pitch_count),
+                    build_ratings
                 )
-                
-                fig_metrics.update_layout(
-                    title="<b>Performance Ratings</b>",
-                    barmode='group',
-                    xaxis_title="Pitch Type",
-                    yaxis_title="Rating",
-                    template=plotly_template,
-                    height=400
+            
+            # Percentiles within each pitch type across the league
+            st.markdown("## League Percentiles")
+            
+            show_cached_chart(
+                figure_key('profile', 'percentiles', selected_pitcher_id, min_pitch_count),
+                lambda: create_percentile_plot(
+                    pitcher_pitches_filtered['TaggedPitchType'].astype(str).tolist(),
+                    pitcher_percentiles
                 )
-                
-                st.plotly_chart(fig_metrics, use_container_width=True)
+            )
             
             # Detailed pitch type table
             st.markdown("## Detailed Metrics")
@@ -808,31 +908,80 @@ with tab2:
                 'Avg_Extension', 'Avg_RelHeight', 'Avg_RelSide'
             ]
             
-            pitch_display = pitcher_pitches_filtered[display_cols].copy()
+            pitch_display = pitcher_pitches_filtered[display_cols]
             pitch_display = pitch_display.sort_values('Pitch_Count', ascending=False)
             
             # Format all columns without trailing zeros
             formatted_display = pd.DataFrame()
             formatted_display['Pitch Type'] = pitch_display['TaggedPitchType']
             formatted_display['Count'] = pitch_display['Pitch_Count'].astype(int)
-            formatted_display['Stuff+'] = pitch_display['StuffPlus'].apply(lambda x: format_number(x, 1))
-            formatted_display['Pitching+'] = pitch_display['PitchingPlus'].apply(lambda x: format_number(x, 1))
-            formatted_display['Velo'] = pitch_display['Avg_Velocity'].apply(lambda x: format_number(x, 1))
-            formatted_display['IVB'] = pitch_display['Avg_InducedVert'].apply(lambda x: format_number(x, 1))
-            formatted_display['HB'] = pitch_display['Avg_HorzBreak'].apply(lambda x: format_number(x, 1))
-            formatted_display['Spin'] = pitch_display['Avg_SpinRate'].apply(lambda x: format_number(x, 0))
-            formatted_display['Ext'] = pitch_display['Avg_Extension'].apply(lambda x: format_number(x, 1))
-            formatted_display['RelH'] = pitch_display['Avg_RelHeight'].apply(lambda x: format_number(x, 1))
-            formatted_display['RelS'] = pitch_display['Avg_RelSide'].apply(lambda x: format_number(x, 1))
+            formatted_display['Stuff+'] = round_column(pitch_display['StuffPlus'], 1)
+            formatted_display['Pitching+'] = round_column(pitch_display['PitchingPlus'], 1)
+            formatted_display['Velo'] = round_column(pitch_display['Avg_Velocity'], 1)
+            formatted_display['IVB'] = round_column(pitch_display['Avg_InducedVert'], 1)
+            formatted_display['HB'] = round_column(pitch_display['Avg_HorzBreak'], 1)
+            formatted_display['Spin'] = round_column(pitch_display['Avg_SpinRate'], 0)
+            formatted_display['Ext'] = round_column(pitch_display['Avg_Extension'], 1)
+            formatted_display['RelH'] = round_column(pitch_display['Avg_RelHeight'], 1)
+            formatted_display['RelS'] = round_column(pitch_display['Avg_RelSide'], 1)
+            
+            # Percentile columns, looked up rather than computed per selection
+            percentile_display = pitcher_percentiles.loc[pitch_display.index]
+            percentile_config = {}
+            for label in percentile_display.columns:
+                formatted_display[f'{label} %ile'] = round_column(percentile_display[label], 0)
+                percentile_config[f'{label} %ile'] = st.column_config.ProgressColumn(
+                    f'{label} %ile', min_value=0, max_value=100, format="%d"
+                )
             
             st.dataframe(
                 formatted_display,
                 use_container_width=True,
-                height=400
+                height=400,
+                column_config={
+                    **plain_number_columns(
+                        'Stuff+', 'Pitching+', 'Velo', 'IVB', 'HB', 'Spin', 'Ext', 'RelH', 'RelS'
+                    ),
+                    **percentile_config
+                }
+            )
+            
+            # Nearest neighbours by pitch shape
+            st.markdown("## Similar Pitches")
+            render_similar_pitches(
+                selected_pitcher_id,
+                pitch_display['TaggedPitchType'].astype(str).tolist()
+            )
+            
+            # Nearest neighbours by whole arsenal: pitch mix plus the shape of each pitch
+            st.markdown("## Similar Arsenals")
+            arsenal_comps = data.similar_arsenals(selected_pitcher_id, k=10)
+            
+            formatted_arsenals = pd.DataFrame()
+            formatted_arsenals['Pitcher'] = arsenal_comps['Pitcher']
+            formatted_arsenals['Team'] = arsenal_comps['PitcherTeam']
+            formatted_arsenals['Mix'] = [
+                pitch_mix(pitcher_id(pitcher, team))
+                for pitcher, team in zip(arsenal_comps['Pitcher'], arsenal_comps['PitcherTeam'])
+            ]
+            formatted_arsenals['Pitches'] = arsenal_comps['Total_Pitches'].astype(int)
+            formatted_arsenals['Pitching+'] = round_column(arsenal_comps['Overall_PitchingPlus'], 1)
+            formatted_arsenals['Stuff+'] = round_column(arsenal_comps['Overall_StuffPlus'], 1)
+            formatted_arsenals['Velo'] = round_column(arsenal_comps['Avg_Velocity'], 1)
+            formatted_arsenals['Distance'] = round_column(arsenal_comps['Distance'], 2)
+            formatted_arsenals.index = range(1, len(formatted_arsenals) + 1)
+            
+            st.caption(f"{data.pitcher_label(selected_pitcher_id, with_team=False)}: {pitch_mix(selected_pitcher_id)}")
+            st.dataframe(
+                formatted_arsenals,
+                use_container_width=True,
+                column_config=plain_number_columns('Pitching+', 'Stuff+', 'Velo', 'Distance')
             )
 
 # ==================== TAB 3: PITCH TYPE ANALYSIS ====================
-with tab3:
+@st.fragment
+def render_pitch_type_analysis():
+    ensure_current_data()
     st.markdown("## Pitch Type Analysis")
     
     # Filters for Pitch Type Analysis
@@ -840,11 +989,11 @@ with tab3:
     col1, col2, col3 = st.columns(3)
     
     with col1:
-        teams_pitch = ['All Teams'] + sorted(pitch_type_df['PitcherTeam'].unique().tolist())
+        teams_pitch = ['All Teams'] + list(data.pitch_type_teams)
         selected_team_pitch = st.selectbox("Team Filter", teams_pitch, key="pitch_team")
     
     with col2:
-        pitch_types = sorted(pitch_type_df['TaggedPitchType'].unique().tolist())
+        pitch_types = list(data.pitch_types)
         selected_pitch_type = st.selectbox("Pitch Type", pitch_types, key="pitch_type")
     
     with col3:
@@ -852,7 +1001,6 @@ with tab3:
             "Minimum Pitches",
             min_value=0,
             max_value=100,
-            value=10,
             step=5,
             key="pitch_min_pitches"
         )
@@ -860,15 +1008,8 @@ with tab3:
     st.markdown("</div>", unsafe_allow_html=True)
     
     # Apply filters
-    if selected_team_pitch != 'All Teams':
-        pitch_filtered = pitch_type_df[pitch_type_df['PitcherTeam'] == selected_team_pitch]
-    else:
-        pitch_filtered = pitch_type_df.copy()
-    
-    pitch_data = pitch_filtered[
-        (pitch_filtered['TaggedPitchType'] == selected_pitch_type) &
-        (pitch_filtered['Pitch_Count'] >= min_pitches_pitch)
-    ].copy()
+    pitch_team = None if selected_team_pitch == 'All Teams' else selected_team_pitch
+    pitch_data = data.qualified_pitch_types(pitch_team, selected_pitch_type, min_pitches_pitch)
     
     if len(pitch_data) == 0:
         st.warning("⚠️ No pitchers meet the selected criteria. Try adjusting your filters.")
@@ -896,51 +1037,72 @@ with tab3:
         # Movement scatter plot for all pitchers
         st.markdown("## Movement Profile Comparison")
         
-        fig_movement_scatter = go.Figure()
-        
-        # Calculate smaller bubble sizes for the scatter plot - max 15 pixels
-        sizes = pitch_data['Pitch_Count'].apply(lambda x: min(5 + (x / 80), 15))
+        movement_mode = scatter_render_mode(len(pitch_data))
+        if movement_mode == 'density':
+            st.caption(f"Showing pitcher density for {len(pitch_data):,} pitchers")
         
-        # Add scatter for each pitcher
-        fig_movement_scatter.add_trace(go.Scatter(
-            x=pitch_data['Avg_HorzBreak'],
-            y=pitch_data['Avg_InducedVert'],
-            mode='markers',
-            marker=dict(
-                size=sizes,
-                color=pitch_data['PitchingPlus'],
-                colorscale='RdYlGn',
-                showscale=True,
-                colorbar=dict(title="Pitching+"),
-                line=dict(color='white', width=1),
-                cmin=80,
-                cmax=120
-            ),
-            text=pitch_data['Pitcher'],
-            hovertemplate=(
-                "<b>%{text}</b><br>" +
-                "Horizontal: %{x:.1f}″<br>" +
-                "Vertical: %{y:.1f}″<br>" +
-                "<extra></extra>"
+        def build_movement_comparison():
+            if movement_mode == 'density':
+                fig_movement_scatter = create_density_plot(
+                    pitch_data['Avg_HorzBreak'],
+                    pitch_data['Avg_InducedVert'],
+                    f"{selected_pitch_type} Movement Patterns",
+                    "Horizontal Break (inches)",
+                    "Induced Vertical Break (inches)",
+                    x_range=(-25, 25),
+                    y_range=(-25, 25)
+                )
+            else:
+                fig_movement_scatter = go.Figure()
+                scatter_trace = go.Scattergl if movement_mode == 'webgl' else go.Scatter
+                
+                # Calculate smaller bubble sizes for the scatter plot - max 15 pixels
+                sizes = pitch_data['Pitch_Count'].apply(lambda x: min(5 + (x / 80), 15))
+                
+                # Add scatter for each pitcher
+                fig_movement_scatter.add_trace(scatter_trace(
+                    x=pitch_data['Avg_HorzBreak'],
+                    y=pitch_data['Avg_InducedVert'],
+                    mode='markers',
+                    marker=dict(
+                        size=sizes,
+                        color=pitch_data['PitchingPlus'],
+                        colorscale='RdYlGn',
+                        showscale=True,
+                        colorbar=dict(title="Pitching+"),
+                        line=dict(color='white', width=1),
+                        cmin=80,
+                        cmax=120
+                    ),
+                    text=pitch_data['Pitcher'],
+                    hovertemplate=(
+                        "<b>%{text}</b><br>" +
+                        "Horizontal: %{x:.1f}″<br>" +
+                        "Vertical: %{y:.1f}″<br>" +
+                        "<extra></extra>"
+                    )
+                ))
+            
+            # Add quadrant lines
+            fig_movement_scatter.add_hline(y=0, line_dash="dash", line_color="#666", opacity=0.5)
+            fig_movement_scatter.add_vline(x=0, line_dash="dash", line_color="#666", opacity=0.5)
+            
+            fig_movement_scatter.update_layout(
+                title=f"<b>{selected_pitch_type} Movement Patterns</b>",
+                xaxis_title="Horizontal Break (inches)",
+                yaxis_title="Induced Vertical Break (inches)",
+                template=plotly_template,
+                height=600,
+                xaxis=dict(range=[-25, 25]),
+                yaxis=dict(range=[-25, 25])
             )
-        ))
-        
-        # Add quadrant lines
-        fig_movement_scatter.add_hline(y=0, line_dash="dash", line_color="#666", opacity=0.5)
-        fig_movement_scatter.add_vline(x=0, line_dash="dash", line_color="#666", opacity=0.5)
+            return fig_movement_scatter
         
-        fig_movement_scatter.update_layout(
-            title=f"<b>{selected_pitch_type} Movement Patterns</b>",
-            xaxis_title="Horizontal Break (inches)",
-            yaxis_title="Induced Vertical Break (inches)",
-            template=plotly_template,
-            height=600,
-            xaxis=dict(range=[-25, 25]),
-            yaxis=dict(range=[-25, 25])
+        show_cached_chart(
+            figure_key('pitch_type', 'movement', selected_team_pitch, selected_pitch_type, min_pitches_pitch),
+            build_movement_comparison
         )
         
-        st.plotly_chart(fig_movement_scatter, use_container_width=True)
-        
         st.markdown("---")
         
         # Top performers
@@ -950,35 +1112,45 @@ with tab3:
         
         with col1:
             st.markdown("### 🏆 Top 10 by Pitching+")
-            top_pitching = pitch_data.nlargest(10, 'PitchingPlus')[
+            top_pitching = data.rankings.top(pitch_team, selected_pitch_type, 'Pitching+', min_pitches_pitch)[
                 ['Pitcher', 'PitcherTeam', 'PitchingPlus', 'Pitch_Count', 'Avg_Velocity']
             ].copy()
             
             formatted_top_pitching = pd.DataFrame()
             formatted_top_pitching['Pitcher'] = top_pitching['Pitcher']
             formatted_top_pitching['Team'] = top_pitching['PitcherTeam']
-            formatted_top_pitching['Pitching+'] = top_pitching['PitchingPlus'].apply(lambda x: format_number(x, 1))
+            formatted_top_pitching['Pitching+'] = round_column(top_pitching['PitchingPlus'], 1)
             formatted_top_pitching['Count'] = top_pitching['Pitch_Count'].astype(int)
-            formatted_top_pitching['Velo'] = top_pitching['Avg_Velocity'].apply(lambda x: format_number(x, 1))
+            formatted_top_pitching['Velo'] = round_column(top_pitching['Avg_Velocity'], 1)
             formatted_top_pitching.index = range(1, len(formatted_top_pitching) + 1)
             
-            st.dataframe(formatted_top_pitching, use_container_width=True, height=400)
+            st.dataframe(
+                formatted_top_pitching,
+                use_container_width=True,
+                height=400,
+                column_config=plain_number_columns('Pitching+', 'Velo')
+            )
         
         with col2:
             st.markdown("### 🏆 Top 10 by Stuff+")
-            top_stuff = pitch_data.nlargest(10, 'StuffPlus')[
+            top_stuff = data.rankings.top(pitch_team, selected_pitch_type, 'Stuff+', min_pitches_pitch)[
                 ['Pitcher', 'PitcherTeam', 'StuffPlus', 'Pitch_Count', 'Avg_Velocity']
             ].copy()
             
             formatted_top_stuff = pd.DataFrame()
             formatted_top_stuff['Pitcher'] = top_stuff['Pitcher']
             formatted_top_stuff['Team'] = top_stuff['PitcherTeam']
-            formatted_top_stuff['Stuff+'] = top_stuff['StuffPlus'].apply(lambda x: format_number(x, 1))
+            formatted_top_stuff['Stuff+'] = round_column(top_stuff['StuffPlus'], 1)
             formatted_top_stuff['Count'] = top_stuff['Pitch_Count'].astype(int)
-            formatted_top_stuff['Velo'] = top_stuff['Avg_Velocity'].apply(lambda x: format_number(x, 1))
+            formatted_top_stuff['Velo'] = round_column(top_stuff['Avg_Velocity'], 1)
             formatted_top_stuff.index = range(1, len(formatted_top_stuff) + 1)
             
-            st.dataframe(formatted_top_stuff, use_container_width=True, height=400)
+            st.dataframe(
+                formatted_top_stuff,
+                use_container_width=True,
+                height=400,
+                column_config=plain_number_columns('Stuff+', 'Velo')
+            )
         
         st.markdown("---")
         
@@ -988,39 +1160,53 @@ with tab3:
         col1, col2 = st.columns(2)
         
         with col1:
-            fig_vel_pitch = px.scatter(
-                pitch_data,
-                x='Avg_Velocity',
-                y='PitchingPlus',
-                hover_data=['Pitcher', 'PitcherTeam', 'Pitch_Count'],
-                size='Pitch_Count',
-                color='PitchingPlus',
-                title=f"<b>{selected_pitch_type}: Velocity vs Pitching+</b>",
-                labels={'Avg_Velocity': 'Velocity (mph)', 'PitchingPlus': 'Pitching+'},
-                color_continuous_scale='RdYlGn'
+            def build_velocity_pitching():
+                fig_vel_pitch = px.scatter(
+                    pitch_data,
+                    x='Avg_Velocity',
+                    y='PitchingPlus',
+                    hover_data=['Pitcher', 'PitcherTeam', 'Pitch_Count'],
+                    size='Pitch_Count',
+                    color='PitchingPlus',
+                    title=f"<b>{selected_pitch_type}: Velocity vs Pitching+</b>",
+                    labels={'Avg_Velocity': 'Velocity (mph)', 'PitchingPlus': 'Pitching+'},
+                    color_continuous_scale='RdYlGn'
+                )
+                fig_vel_pitch.add_hline(y=100, line_dash="dash", line_color="#ff4b4b")
+                fig_vel_pitch.update_layout(template=plotly_template, height=500)
+                return fig_vel_pitch
+            
+            show_cached_chart(
+                figure_key('pitch_type', 'velocity_pitching', selected_team_pitch, selected_pitch_type, min_pitches_pitch),
+                build_velocity_pitching
             )
-            fig_vel_pitch.add_hline(y=100, line_dash="dash", line_color="#ff4b4b")
-            fig_vel_pitch.update_layout(template=plotly_template, height=500)
-            st.plotly_chart(fig_vel_pitch, use_container_width=True)
         
         with col2:
-            fig_vel_stuff = px.scatter(
-                pitch_data,
-                x='Avg_Velocity',
-                y='StuffPlus',
-                hover_data=['Pitcher', 'PitcherTeam', 'Pitch_Count'],
-                size='Pitch_Count',
-                color='StuffPlus',
-                title=f"<b>{selected_pitch_type}: Velocity vs Stuff+</b>",
-                labels={'Avg_Velocity': 'Velocity (mph)', 'StuffPlus': 'Stuff+'},
-                color_continuous_scale='RdYlGn'
+            def build_velocity_stuff():
+                fig_vel_stuff = px.scatter(
+                    pitch_data,
+                    x='Avg_Velocity',
+                    y='StuffPlus',
+                    hover_data=['Pitcher', 'PitcherTeam', 'Pitch_Count'],
+                    size='Pitch_Count',
+                    color='StuffPlus',
+                    title=f"<b>{selected_pitch_type}: Velocity vs Stuff+</b>",
+                    labels={'Avg_Velocity': 'Velocity (mph)', 'StuffPlus': 'Stuff+'},
+                    color_continuous_scale='RdYlGn'
+                )
+                fig_vel_stuff.add_hline(y=100, line_dash="dash", line_color="#ff4b4b")
+                fig_vel_stuff.update_layout(template=plotly_template, height=500)
+                return fig_vel_stuff
+            
+            show_cached_chart(
+                figure_key('pitch_type', 'velocity_stuff', selected_team_pitch, selected_pitch_type, min_pitches_pitch),
+                build_velocity_stuff
             )
-            fig_vel_stuff.add_hline(y=100, line_dash="dash", line_color="#ff4b4b")
-            fig_vel_stuff.update_layout(template=plotly_template, height=500)
-            st.plotly_chart(fig_vel_stuff, use_container_width=True)
 
 # ==================== TAB 4: RANKINGS ====================
-with tab4:
+@st.fragment
+def render_rankings():
+    ensure_current_data()
     st.markdown("## Pitcher Rankings")
     
     # Filters for Rankings
@@ -1035,7 +1221,7 @@ with tab4:
         )
     
     with col2:
-        teams_rank = ['All Teams'] + sorted(overall_df['PitcherTeam'].unique().tolist())
+        teams_rank = ['All Teams'] + list(data.teams)
         selected_team_rank = st.selectbox("Team Filter", teams_rank, key="rank_team")
     
     with col3:
@@ -1050,103 +1236,152 @@ with tab4:
             "Minimum Pitches",
             min_value=0,
             max_value=200,
-            value=50,
             step=10,
             key="rank_min_pitches"
         )
     
     st.markdown("</div>", unsafe_allow_html=True)
     
+    # Leaderboards come pre-sorted from the ranking index
+    rank_team = None if selected_team_rank == 'All Teams' else selected_team_rank
+    metric_name = metric_rank.lower().replace('+', 'plus')
+    
     if ranking_type == "Overall Performance":
-        # Apply filters
-        if selected_team_rank != 'All Teams':
-            rank_filtered = overall_df[overall_df['PitcherTeam'] == selected_team_rank]
-        else:
-            rank_filtered = overall_df.copy()
-        
-        rank_filtered = rank_filtered[rank_filtered['Total_Pitches'] >= min_pitches_rank]
-        
-        # Sort
-        sort_col = 'Overall_PitchingPlus' if metric_rank == 'Pitching+' else 'Overall_StuffPlus'
-        ranked_df = rank_filtered.sort_values(sort_col, ascending=False).reset_index(drop=True)
+        ranked_df = data.rankings.ranked(rank_team, None, metric_rank, min_pitches_rank).reset_index(drop=True)
         
         # Format display
         formatted_ranked = pd.DataFrame()
         formatted_ranked['Rank'] = range(1, len(ranked_df) + 1)
         formatted_ranked['Pitcher'] = ranked_df['Pitcher']
         formatted_ranked['Team'] = ranked_df['PitcherTeam']
-        formatted_ranked['Pitching+'] = ranked_df['Overall_PitchingPlus'].apply(lambda x: format_number(x, 1))
-        formatted_ranked['Stuff+'] = ranked_df['Overall_StuffPlus'].apply(lambda x: format_number(x, 1))
+        formatted_ranked['Pitching+'] = round_column(ranked_df['Overall_PitchingPlus'], 1)
+        formatted_ranked['Stuff+'] = round_column(ranked_df['Overall_StuffPlus'], 1)
         formatted_ranked['Pitches'] = ranked_df['Total_Pitches'].astype(int)
         formatted_ranked['Arsenal'] = ranked_df['Num_Pitch_Types'].astype(int)
-        formatted_ranked['Velo'] = ranked_df['Avg_Velocity'].apply(lambda x: format_number(x, 1))
+        formatted_ranked['Velo'] = round_column(ranked_df['Avg_Velocity'], 1)
         
         st.dataframe(
             formatted_ranked,
             use_container_width=True,
-            height=700
+            height=700,
+            column_config=plain_number_columns('Pitching+', 'Stuff+', 'Velo')
         )
         
-        # Download button
-        csv = ranked_df.to_csv(index=False)
-        st.download_button(
-            label="📥 Download Rankings as CSV",
-            data=csv,
-            file_name=f"overall_rankings_{metric_rank.lower().replace('+', 'plus')}.csv",
-            mime="text/csv"
-        )
+        export_pitch_type = None
+        export_name = f"overall_rankings_{metric_name}"
     
     else:
         # By pitch type
         pitch_type_rank = st.selectbox(
             "Select Pitch Type",
-            sorted(pitch_type_df['TaggedPitchType'].unique()),
+            list(data.pitch_types),
             key="rank_pitch_type"
         )
         
-        # Apply filters
-        if selected_team_rank != 'All Teams':
-            rank_filtered = pitch_type_df[pitch_type_df['PitcherTeam'] == selected_team_rank]
-        else:
-            rank_filtered = pitch_type_df.copy()
-        
-        pitch_ranked = rank_filtered[
-            (rank_filtered['TaggedPitchType'] == pitch_type_rank) &
-            (rank_filtered['Pitch_Count'] >= min_pitches_rank)
-        ].copy()
-        
-        # Sort
-        sort_col = 'PitchingPlus' if metric_rank == 'Pitching+' else 'StuffPlus'
-        pitch_ranked = pitch_ranked.sort_values(sort_col, ascending=False).reset_index(drop=True)
+        pitch_ranked = data.rankings.ranked(
+            rank_team, pitch_type_rank, metric_rank, min_pitches_rank
+        ).reset_index(drop=True)
         
         # Format display
         formatted_pitch_ranked = pd.DataFrame()
         formatted_pitch_ranked['Rank'] = range(1, len(pitch_ranked) + 1)
         formatted_pitch_ranked['Pitcher'] = pitch_ranked['Pitcher']
         formatted_pitch_ranked['Team'] = pitch_ranked['PitcherTeam']
-        formatted_pitch_ranked['Pitching+'] = pitch_ranked['PitchingPlus'].apply(lambda x: format_number(x, 1))
-        formatted_pitch_ranked['Stuff+'] = pitch_ranked['StuffPlus'].apply(lambda x: format_number(x, 1))
+        formatted_pitch_ranked['Pitching+'] = round_column(pitch_ranked['PitchingPlus'], 1)
+        formatted_pitch_ranked['Stuff+'] = round_column(pitch_ranked['StuffPlus'], 1)
         formatted_pitch_ranked['Count'] = pitch_ranked['Pitch_Count'].astype(int)
-        formatted_pitch_ranked['Velo'] = pitch_ranked['Avg_Velocity'].apply(lambda x: format_number(x, 1))
-        formatted_pitch_ranked['IVB'] = pitch_ranked['Avg_InducedVert'].apply(lambda x: format_number(x, 1))
-        formatted_pitch_ranked['HB'] = pitch_ranked['Avg_HorzBreak'].apply(lambda x: format_number(x, 1))
-        formatted_pitch_ranked['Spin'] = pitch_ranked['Avg_SpinRate'].apply(lambda x: format_number(x, 0))
+        formatted_pitch_ranked['Velo'] = round_column(pitch_ranked['Avg_Velocity'], 1)
+        formatted_pitch_ranked['IVB'] = round_column(pitch_ranked['Avg_InducedVert'], 1)
+        formatted_pitch_ranked['HB'] = round_column(pitch_ranked['Avg_HorzBreak'], 1)
+        formatted_pitch_ranked['Spin'] = round_column(pitch_ranked['Avg_SpinRate'], 0)
         
         st.dataframe(
             formatted_pitch_ranked,
             use_container_width=True,
-            height=700
+            height=700,
+            column_config=plain_number_columns('Pitching+', 'Stuff+', 'Velo', 'IVB', 'HB', 'Spin')
         )
         
-        # Download button
-        csv = pitch_ranked.to_csv(index=False)
+        export_pitch_type = pitch_type_rank
+        export_name = f"{pitch_type_rank}_rankings_{metric_name}"
+    
+    # Download buttons
+    export_format = st.radio(
+        "Export Format",
+        list(EXPORT_FORMATS),
+        horizontal=True,
+        key="rank_export_format"
+    )
+    extension, mime = EXPORT_FORMATS[export_format]
+    
+    st.download_button(
+        label=f"📥 Download Rankings as {export_format}",
+        data=lambda: ranking_export(
+            data, data.version, rank_team, export_pitch_type, metric_rank, min_pitches_rank, export_format
+        ),
+        file_name=f"{export_name}.{extension}",
+        mime=mime,
+        on_click="ignore"
+    )
+    
+    if ranking_type != "Overall Performance":
         st.download_button(
-            label="📥 Download Rankings as CSV",
-            data=csv,
-            file_name=f"{pitch_type_rank}_rankings_{metric_rank.lower().replace('+', 'plus')}.csv",
-            mime="text/csv"
+            label=f"📦 Download All Pitch Types ({export_format}, zipped)",
+            data=lambda: pitch_type_rankings_export(
+                data, data.version, rank_team, metric_rank, min_pitches_rank, export_format
+            ),
+            file_name=f"pitch_type_rankings_{metric_name}.zip",
+            mime="application/zip",
+            on_click="ignore"
         )
 
+# Filter widgets whose state outlives a view switch. Their defaults are set
+# here rather than through value=, since Streamlit warns about a widget that has
+# a default and also has its key assigned through the Session State API
+FILTER_DEFAULTS = {
+    'overview_team': None,
+    'overview_min_pitches': 50,
+    'overview_league_overlay': None,
+    'profile_team': None,
+    'profile_search': None,
+    'profile_pitcher': None,
+    'profile_min_count': 5,
+    'profile_similar_same_type': True,
+    'pitch_team': None,
+    'pitch_type': None,
+    'pitch_min_pitches': 10,
+    'ranking_type': None,
+    'rank_team': None,
+    'rank_metric': None,
+    'rank_min_pitches': 50,
+    'rank_pitch_type': None
+}
+
+# Views that are not shown do not render their widgets; re-assigning the filter
+# keys keeps each view's filters until the user switches back to it
+for key, default in FILTER_DEFAULTS.items():
+    if key in st.session_state:
+        st.session_state[key] = st.session_state[key]
+    elif default is not None:
+        st.session_state[key] = default
+
+# Main content - only the selected view runs on each rerun, and widgets inside a
+# view rerun just that view's fragment
+views = {
+    "📊 Overview": render_overview,
+    "👤 Pitcher Profile": render_pitcher_profile,
+    "🎯 Pitch Type Analysis": render_pitch_type_analysis,
+    "📈 Rankings": render_rankings
+}
+selected_view = st.radio(
+    "View",
+    list(views),
+    horizontal=True,
+    key="active_view",
+    label_visibility="collapsed"
+)
+views[selected_view]()
+
 # Footer
 st.markdown("---")
 st.markdown("""
@@ -0,0 +1,617 @@
+"""Shared, read-only pitcher datasets.
+
+The dashboard builds one PitcherDataset per server process and every session
+reads from it directly. Column arrays are marked read-only so an accidental
+in-place write raises instead of leaking into other sessions; filters and
+sorts always produce new frames.
+
+Both tables are sorted by team and pitcher, so a pitcher's rows (keyed by the
+stable ID from pitch_store.pitcher_id) and a team's rows are contiguous and
+are read as slices rather than boolean masks.
+
+Each table carries a version derived from its CSV's content hash. The
+DatasetWatcher stats the CSVs at most once per interval and, when one
+changes, reloads only that table; indexes built from an unchanged table are
+carried over to the new dataset. A reload that fails (say, a CSV caught
+mid-copy) is logged and the old dataset keeps being served until it
+succeeds. The leaderboards, lookups, search, percentile and similarity
+indexes are only built the first time they are used, so batch jobs that just
+read one leaderboard don't pay for the rest.
+
+Nothing here imports Streamlit or Plotly; the dashboard and pitcher_cli.py
+both query a PitcherDataset.
+"""
+import hashlib
+import io
+import json
+import logging
+import threading
+import time
+import zipfile
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from pitch_similarity import ArsenalSimilarityIndex, PitchSimilarityIndex
+from pitch_store import file_signature, pitcher_id
+from pitcher_search import PitcherSearchIndex
+from summary_snapshot import (
+    OVERALL_COLUMNS,
+    OVERALL_SUMMARY_FILE,
+    PITCH_TYPE_COLUMNS,
+    PITCH_TYPE_SUMMARY_FILE,
+    load_summaries,
+    load_summary,
+    snapshot_version
+)
+
+logger = logging.getLogger(__name__)
+
+# Source CSV and required columns per table name
+SUMMARY_TABLES = {'pitch_type': PITCH_TYPE_SUMMARY_FILE, 'overall': OVERALL_SUMMARY_FILE}
+SUMMARY_COLUMNS = {'pitch_type': PITCH_TYPE_COLUMNS, 'overall': OVERALL_COLUMNS}
+DEFAULT_WATCH_INTERVAL = 5.0
+DISTRIBUTION_BINS = 30
+HISTOGRAM_CACHE_ENTRIES = 256
+
+# Percentile label -> pitch type metric it ranks within each TaggedPitchType.
+# Horizontal break is ranked by magnitude, since its sign follows handedness
+PERCENTILE_METRICS = {
+    'Velo': 'Avg_Velocity',
+    'IVB': 'Avg_InducedVert',
+    'HB': 'Avg_HorzBreak',
+    'Spin': 'Avg_SpinRate',
+    'Ext': 'Avg_Extension',
+    'Stuff+': 'StuffPlus',
+    'Pitching+': 'PitchingPlus'
+}
+
+# Indexes built on first use -> tables they are derived from
+LAZY_INDEXES = {
+    '_overall_ids': ('overall',),
+    '_overall_rows': ('overall',),
+    '_overall_team_rows': ('overall',),
+    '_pitch_type_rows': ('pitch_type',),
+    '_pitch_type_team_rows': ('pitch_type',),
+    '_labels': ('overall',),
+    'pitcher_ids': ('overall',),
+    '_busiest': ('overall',),
+    'pitch_type_percentiles': ('pitch_type',),
+    'similarity': ('pitch_type',),
+    'search': ('overall',),
+    'arsenals': ('pitch_type', 'overall')
+}
+
+# Download formats: file extension and MIME type
+EXPORT_FORMATS = {
+    'CSV': ('csv', 'text/csv'),
+    'Parquet': ('parquet', 'application/vnd.apache.parquet')
+}
+EXPORT_DECIMALS = 3
+
+
+def _read_only_array(values):
+    values = np.array(values, copy=True)
+    values.flags.writeable = False
+    return values
+
+
+def dataset_version(table_versions):
+    """Short version string combining the per-table versions"""
+    versions = json.dumps(table_versions, sort_keys=True)
+    return hashlib.sha1(versions.encode()).hexdigest()[:12]
+
+
+def freeze_frame(df):
+    """Rebuild a frame on top of read-only NumPy columns"""
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            codes = _read_only_array(series.cat.codes.to_numpy())
+            columns[col] = pd.Categorical.from_codes(codes, dtype=series.dtype)
+        else:
+            columns[col] = _read_only_array(series.to_numpy())
+    return pd.DataFrame(columns, copy=False)
+
+
+def _row_ranges(keys):
+    """(start, stop) of each run of equal keys in a sorted list"""
+    keys = np.asarray(keys, dtype=object)
+    if len(keys) == 0:
+        return {}
+    breaks = np.flatnonzero(keys[1:] != keys[:-1]) + 1
+    starts = np.concatenate(([0], breaks)).tolist()
+    stops = np.concatenate((breaks, [len(keys)])).tolist()
+    return {keys[start]: (start, stop) for start, stop in zip(starts, stops)}
+
+
+def _pitcher_keys(df):
+    return [pitcher_id(pitcher, team) for pitcher, team in zip(df['Pitcher'], df['PitcherTeam'])]
+
+
+def _sort_by_pitcher(df):
+    return df.sort_values(['PitcherTeam', 'Pitcher'], kind='stable').reset_index(drop=True)
+
+
+# Metric columns and pitch count column per table, keyed by the dashboard's labels
+OVERALL_METRICS = {'Pitching+': 'Overall_PitchingPlus', 'Stuff+': 'Overall_StuffPlus'}
+PITCH_TYPE_METRICS = {'Pitching+': 'PitchingPlus', 'Stuff+': 'StuffPlus'}
+
+
+def pitch_type_percentiles(pitch_type_df):
+    """Percentile (0-100) of every pitch type row's metrics within its pitch type"""
+    values = pitch_type_df[list(PERCENTILE_METRICS.values())].astype('float64')
+    values['Avg_HorzBreak'] = values['Avg_HorzBreak'].abs()
+    ranks = values.groupby(pitch_type_df['TaggedPitchType'], observed=True).rank(pct=True) * 100
+    ranks.columns = list(PERCENTILE_METRICS)
+    return ranks.astype('float32')
+
+
+def _group_orders(codes, metric, n_groups):
+    """Row order sorted by group code, then metric descending with NaN last"""
+    descending = -metric.astype('float64')
+    descending[np.isnan(descending)] = np.inf
+    order = np.lexsort((descending, codes))
+    sorted_codes = codes[order]
+    starts = np.searchsorted(sorted_codes, np.arange(n_groups + 1))
+    return order, starts
+
+
+def _ranking_entry(positions, counts, metric):
+    """(positions, pitch counts, has-metric mask) for one sorted leaderboard, None when empty"""
+    if len(positions) == 0:
+        return None
+    return positions, counts[positions], ~np.isnan(metric[positions])
+
+
+class RankingIndex:
+    """Sorted leaderboards per (team or all, pitch type or overall, metric)
+
+    Each entry holds row positions sorted by the metric plus the pitch counts
+    aligned to that order, so a minimum-pitch threshold is a vectorized mask
+    and leaderboards never re-sort. Entries are sorted the first time they are
+    asked for, so a one-off query only filters and sorts its own rows; build()
+    sorts every leaderboard at once.
+    """
+
+    def __init__(self, pitch_type_df, overall_df, previous=None):
+        self._tables = {False: overall_df, True: pitch_type_df}
+        self._entries = {}
+        if previous is not None:
+            # Same table object: its leaderboards are still valid
+            self._entries.update(
+                (key, entry) for key, entry in previous._entries.copy().items()
+                if previous._tables[key[1] is not None] is self._tables[key[1] is not None]
+            )
+
+    def build(self):
+        """Sort every leaderboard of both tables"""
+        for by_pitch_type, metrics, count_col in [
+            (False, OVERALL_METRICS, 'Total_Pitches'),
+            (True, PITCH_TYPE_METRICS, 'Pitch_Count')
+        ]:
+            self._add(self._tables[by_pitch_type], metrics, count_col, by_pitch_type)
+        return self
+
+    def _add(self, df, metrics, count_col, by_pitch_type):
+        counts = df[count_col].to_numpy()
+        team_codes, teams = pd.factorize(df['PitcherTeam'].astype(str).to_numpy())
+        if by_pitch_type:
+            type_codes, pitch_types = pd.factorize(df['TaggedPitchType'].astype(str).to_numpy())
+        else:
+            type_codes, pitch_types = np.zeros(len(df), dtype='int64'), [None]
+
+        # League-wide and per-team groupings as integer codes, keyed by (team, pitch type)
+        groupings = [
+            (type_codes, [(None, pitch_type) for pitch_type in pitch_types]),
+            (team_codes * len(pitch_types) + type_codes,
+             [(team, pitch_type) for team in teams for pitch_type in pitch_types])
+        ]
+        for codes, keys in groupings:
+            for label, metric_col in metrics.items():
+                metric = df[metric_col].to_numpy()
+                order, starts = _group_orders(codes, metric, len(keys))
+                for code, (team, pitch_type) in enumerate(keys):
+                    positions = order[starts[code]:starts[code + 1]]
+                    self._entries[(team, pitch_type, label)] = _ranking_entry(positions, counts, metric)
+
+    def _entry(self, team, pitch_type, metric):
+        key = (team, pitch_type, metric)
+        if key in self._entries:
+            return self._entries[key]
+
+        by_pitch_type = pitch_type is not None
+        df = self._tables[by_pitch_type]
+        metric_col = (PITCH_TYPE_METRICS if by_pitch_type else OVERALL_METRICS).get(metric)
+        keep = np.ones(len(df), dtype=bool)
+        if team is not None:
+            keep &= (df['PitcherTeam'].astype(str) == team).to_numpy()
+        if by_pitch_type:
+            keep &= (df['TaggedPitchType'].astype(str) == pitch_type).to_numpy()
+        entry = None
+        if metric_col is not None and keep.any():
+            rows = np.flatnonzero(keep)
+            metric = df[metric_col].to_numpy()
+            order, _ = _group_orders(np.zeros(len(rows), dtype='int64'), metric[rows], 1)
+            count_col = 'Pitch_Count' if by_pitch_type else 'Total_Pitches'
+            entry = _ranking_entry(rows[order], df[count_col].to_numpy(), metric)
+
+        # Building the same entry twice in two threads is harmless; both are equal
+        self._entries[key] = entry
+        return entry
+
+    def positions(self, team, pitch_type, metric, min_pitches=0):
+        """Row positions ranked by metric for pitchers meeting the pitch threshold"""
+        entry = self._entry(team, pitch_type, metric)
+        if entry is None:
+            return np.empty(0, dtype='int64')
+        positions, counts, _ = entry
+        return positions[counts >= min_pitches]
+
+    def ranked(self, team, pitch_type, metric, min_pitches=0):
+        """Full leaderboard rows, best first"""
+        table = self._tables[pitch_type is not None]
+        return table.iloc[self.positions(team, pitch_type, metric, min_pitches)]
+
+    def top(self, team, pitch_type, metric, min_pitches=0, n=10):
+        """Top n rows with a metric value, like nlargest on the filtered frame"""
+        table = self._tables[pitch_type is not None]
+        entry = self._entry(team, pitch_type, metric)
+        if entry is None:
+            return table.iloc[[]]
+        positions, counts, has_metric = entry
+        return table.iloc[positions[(counts >= min_pitches) & has_metric][:n]]
+
+
+class PitcherDataset:
+    """Summary tables and lookup lists shared by all dashboard sessions"""
+
+    def __init__(self, pitch_type_df, overall_df, table_versions=None, previous=None):
+        self.table_versions = dict(table_versions or {})
+        self.version = dataset_version(self.table_versions) if table_versions else None
+
+        # Frames handed over from the previous dataset are already sorted and frozen
+        if previous is None or pitch_type_df is not previous.pitch_type_df:
+            pitch_type_df = freeze_frame(_sort_by_pitcher(pitch_type_df))
+        if previous is None or overall_df is not previous.overall_df:
+            overall_df = freeze_frame(_sort_by_pitcher(overall_df))
+        self.pitch_type_df = pitch_type_df
+        self.overall_df = overall_df
+
+        # Reentrant, since some lazy lookups are built from others
+        self._index_lock = threading.RLock()
+
+        # Indexes the previous dataset already built from tables that did not change
+        self._indexes = {}
+        if previous is not None:
+            unchanged = {
+                'pitch_type': pitch_type_df is previous.pitch_type_df,
+                'overall': overall_df is previous.overall_df
+            }
+            self._indexes = {
+                name: index for name, index in previous._indexes.items()
+                if all(unchanged[table] for table in LAZY_INDEXES[name])
+            }
+
+        # Filter options are fixed for the lifetime of the dataset
+        self.teams = tuple(sorted(self.overall_df['PitcherTeam'].unique().tolist()))
+        self.pitch_type_teams = tuple(sorted(self.pitch_type_df['PitcherTeam'].unique().tolist()))
+        self.pitch_types = tuple(sorted(self.pitch_type_df['TaggedPitchType'].unique().tolist()))
+
+        # Leaderboards are sorted on first use, so a one-off query only sorts its own rows
+        self.rankings = RankingIndex(
+            self.pitch_type_df, self.overall_df, previous.rankings if previous is not None else None
+        )
+
+        # Bin edges and counts per (metric, team, min_pitches), least recently used dropped first
+        self._histograms = OrderedDict()
+        self._histogram_lock = threading.Lock()
+
+    def _index(self, name, build):
+        """A lazily built index, shared by every caller once built"""
+        index = self._indexes.get(name)
+        if index is None:
+            with self._index_lock:
+                index = self._indexes.get(name)
+                if index is None:
+                    index = self._indexes[name] = build()
+        return index
+
+    # Row ranges per pitcher ID and per team in both tables, and the pitcher
+    # lists built from them, are lazy too: a batch job reading one leaderboard
+    # needs none of them
+
+    @property
+    def _overall_ids(self):
+        return self._index('_overall_ids', lambda: _pitcher_keys(self.overall_df))
+
+    @property
+    def _overall_rows(self):
+        return self._index('_overall_rows', lambda: _row_ranges(self._overall_ids))
+
+    @property
+    def _pitch_type_rows(self):
+        return self._index('_pitch_type_rows', lambda: _row_ranges(_pitcher_keys(self.pitch_type_df)))
+
+    @property
+    def _overall_team_rows(self):
+        return self._index(
+            '_overall_team_rows', lambda: _row_ranges(self.overall_df['PitcherTeam'].astype(str).tolist())
+        )
+
+    @property
+    def _pitch_type_team_rows(self):
+        return self._index(
+            '_pitch_type_team_rows', lambda: _row_ranges(self.pitch_type_df['PitcherTeam'].astype(str).tolist())
+        )
+
+    @property
+    def _labels(self):
+        """Pitcher ID -> (name, team)"""
+        def build():
+            names = self.overall_df['Pitcher'].astype(str).tolist()
+            teams = self.overall_df['PitcherTeam'].astype(str).tolist()
+            return {pid: (name, team) for pid, name, team in zip(self._overall_ids, names, teams)}
+        return self._index('_labels', build)
+
+    @property
+    def pitcher_ids(self):
+        """Pitcher IDs in name order, for the pitcher pickers"""
+        def build():
+            return tuple(pid for pid, _ in sorted(self._labels.items(), key=lambda item: item[1]))
+        return self._index('pitcher_ids', build)
+
+    @property
+    def _busiest(self):
+        def build():
+            busiest = np.argsort(-self.overall_df['Total_Pitches'].to_numpy(), kind='stable')
+            return tuple(self._overall_ids[i] for i in busiest.tolist())
+        return self._index('_busiest', build)
+
+    @property
+    def pitch_type_percentiles(self):
+        """Percentiles lining up row for row with pitch_type_df"""
+        return self._index(
+            'pitch_type_percentiles', lambda: freeze_frame(pitch_type_percentiles(self.pitch_type_df))
+        )
+
+    @property
+    def similarity(self):
+        """Pitch shape index over pitch_type_df rows"""
+        return self._index('similarity', lambda: PitchSimilarityIndex(self.pitch_type_df))
+
+    @property
+    def search(self):
+        """Pitcher name search and per-team pitcher lists"""
+        return self._index('search', lambda: PitcherSearchIndex(self._labels))
+
+    @property
+    def arsenals(self):
+        """Arsenal embeddings, which read both tables"""
+        return self._index('arsenals', lambda: ArsenalSimilarityIndex(self.pitch_type_df, self.overall_df))
+
+    def build_indexes(self):
+        """Build every lazily built index now, for servers that must not build one mid-request"""
+        for name in LAZY_INDEXES:
+            getattr(self, name)
+        self.rankings.build()
+
+    def pitchers(self, team=None):
+        """Pitcher IDs sorted by name, optionally for one team"""
+        if team is None:
+            return list(self.pitcher_ids)
+        return list(self.search.team_pitchers.get(team, []))
+
+    def busiest_pitchers(self, n):
+        """The n pitcher IDs with the most pitches thrown"""
+        return list(self._busiest[:n])
+
+    def has_pitcher(self, pid, team=None):
+        """Whether a pitcher ID exists, optionally on the given team"""
+        return pid in self._labels and (team is None or self._labels[pid][1] == team)
+
+    def pitcher_label(self, pid, with_team=True):
+        """Display name for a pitcher ID"""
+        name, team = self._labels[pid]
+        return f"{name} ({team})" if with_team else name
+
+    def pitcher(self, pid):
+        """Overall summary row for a pitcher ID, or None"""
+        rows = self._overall_rows.get(pid)
+        if rows is None:
+            return None
+        return self.overall_df.iloc[rows[0]]
+
+    def pitcher_pitch_types(self, pid):
+        """Pitch type rows for a pitcher ID"""
+        start, stop = self._pitch_type_rows.get(pid, (0, 0))
+        return self.pitch_type_df.iloc[start:stop]
+
+    def similar_pitches(self, pid, pitch_type, k=10, same_type=True):
+        """Pitch type rows of other pitchers shaped most like one of pid's pitches, nearest first"""
+        start, stop = self._pitch_type_rows.get(pid, (0, 0))
+        own = np.arange(start, stop)
+        matches = own[self.pitch_type_df['TaggedPitchType'].iloc[start:stop].astype(str).to_numpy() == pitch_type]
+        if len(matches) == 0:
+            return self.pitch_type_df.iloc[[]].assign(Distance=[])
+        positions, distances = self.similarity.similar(matches[0], k, same_type, exclude=own.tolist())
+        return self.pitch_type_df.iloc[positions].assign(Distance=distances)
+
+    def similar_arsenals(self, pid, k=10):
+        """Overall rows of the pitchers whose arsenals are closest to pid's, nearest first"""
+        rows = self._overall_rows.get(pid)
+        if rows is None:
+            return self.overall_df.iloc[[]].assign(Distance=[])
+        positions, distances = self.arsenals.similar(rows[0], k)
+        return self.overall_df.iloc[positions].assign(Distance=distances)
+
+    def pitcher_percentiles(self, pid):
+        """Percentile rows for a pitcher ID, aligned with pitcher_pitch_types"""
+        start, stop = self._pitch_type_rows.get(pid, (0, 0))
+        return self.pitch_type_percentiles.iloc[start:stop]
+
+    def team_overall(self, team=None):
+        """Overall rows for one team, or every team when team is None"""
+        if team is None:
+            return self.overall_df
+        start, stop = self._overall_team_rows.get(team, (0, 0))
+        return self.overall_df.iloc[start:stop]
+
+    def qualified_overall(self, team=None, min_pitches=0):
+        """Overall rows for one team (or every team) with at least min_pitches pitches"""
+        rows = self.team_overall(team)
+        return rows[rows['Total_Pitches'].to_numpy() >= min_pitches]
+
+    def _qualified_values(self, metric, team, min_pitches):
+        rows = self.team_overall(team)
+        values = rows[OVERALL_METRICS[metric]].to_numpy(dtype='float64')
+        return values[(rows['Total_Pitches'].to_numpy() >= min_pitches) & np.isfinite(values)]
+
+    def _histogram(self, metric, team, min_pitches):
+        """(edges, counts) for one filter, binned on the league's edges at the same threshold"""
+        key = (metric, team, min_pitches)
+        with self._histogram_lock:
+            histogram = self._histograms.get(key)
+            if histogram is not None:
+                self._histograms.move_to_end(key)
+                return histogram
+
+        if team is None:
+            # Span only the qualified pitchers, so one-pitch outliers don't leave most bins empty
+            values = self._qualified_values(metric, None, min_pitches)
+            low, high = (values.min(), values.max()) if len(values) else (0.0, 1.0)
+            edges = np.linspace(low, max(high, low + 1), DISTRIBUTION_BINS + 1)
+        else:
+            edges = self._histogram(metric, None, min_pitches)[0]
+            values = self._qualified_values(metric, team, min_pitches)
+        counts, _ = np.histogram(values, bins=edges)
+        edges.flags.writeable = False
+        counts.flags.writeable = False
+        histogram = (edges, counts)
+
+        with self._histogram_lock:
+            self._histograms[key] = histogram
+            while len(self._histograms) > HISTOGRAM_CACHE_ENTRIES:
+                self._histograms.popitem(last=False)
+        return histogram
+
+    def distribution_edges(self, metric, min_pitches=0):
+        """League-wide bin edges of an overall metric over pitchers with at least min_pitches pitches"""
+        return self._histogram(metric, None, min_pitches)[0]
+
+    def metric_histogram(self, metric, team=None, min_pitches=0):
+        """Pitcher counts per bin of distribution_edges(metric, min_pitches), cached per filter"""
+        return self._histogram(metric, team, min_pitches)[1]
+
+    def pitch_type_leaderboards(self, team, metric, min_pitches=0):
+        """Leaderboard per pitch type, best first, read straight from the ranking index"""
+        leaderboards = {}
+        for pitch_type in self.pitch_types:
+            ranked = self.rankings.ranked(team, pitch_type, metric, min_pitches)
+            if len(ranked):
+                leaderboards[pitch_type] = ranked
+        return leaderboards
+
+    def team_pitch_types(self, team=None):
+        """Pitch type rows for one team, or every team when team is None"""
+        if team is None:
+            return self.pitch_type_df
+        start, stop = self._pitch_type_team_rows.get(team, (0, 0))
+        return self.pitch_type_df.iloc[start:stop]
+
+    def qualified_pitch_types(self, team, pitch_type, min_pitches=0):
+        """One pitch type's rows for one team (or every team) with at least min_pitches pitches"""
+        rows = self.team_pitch_types(team)
+        keep = (rows['TaggedPitchType'] == pitch_type).to_numpy() & (rows['Pitch_Count'].to_numpy() >= min_pitches)
+        return rows[keep]
+
+
+def frame_bytes(df, export_format='CSV'):
+    """Serialize a frame for download"""
+    if export_format == 'Parquet':
+        # Float32 metrics as rounded float64, so readers see 89.7 like the CSV rather than 89.699997
+        floats = {
+            col: df[col].to_numpy(dtype='float64').round(EXPORT_DECIMALS)
+            for col in df.columns if df[col].dtype == 'float32'
+        }
+        buffer = io.BytesIO()
+        df.assign(**floats).to_parquet(buffer, index=False)
+        return buffer.getvalue()
+    return df.to_csv(index=False).encode()
+
+
+def zip_frames(frames, export_format='CSV'):
+    """Zip archive with one file per named frame"""
+    extension, _ = EXPORT_FORMATS[export_format]
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as archive:
+        for name, df in frames.items():
+            archive.writestr(f"{name}.{extension}", frame_bytes(df, export_format))
+    return buffer.getvalue()
+
+
+def load_dataset(previous=None):
+    """Load both summary tables into a read-only dataset
+
+    With a previous dataset, only tables whose content changed are reloaded.
+    """
+    if previous is None:
+        pitch_type_df, overall_df = load_summaries()
+        versions = {name: snapshot_version(path) for name, path in SUMMARY_TABLES.items()}
+        return PitcherDataset(pitch_type_df, overall_df, versions)
+
+    frames = {'pitch_type': previous.pitch_type_df, 'overall': previous.overall_df}
+    versions = dict(previous.table_versions)
+    for name, path in SUMMARY_TABLES.items():
+        # Refreshes the snapshot when the CSV changed, and is a cheap read otherwise
+        df = load_summary(path, columns=SUMMARY_COLUMNS[name])
+        version = snapshot_version(path)
+        if version != versions.get(name):
+            frames[name] = df
+            versions[name] = version
+    if versions == previous.table_versions:
+        return previous
+    return PitcherDataset(frames['pitch_type'], frames['overall'], versions, previous)
+
+
+class DatasetWatcher:
+    """Serves the latest dataset, reloading changed tables when their CSVs change"""
+
+    def __init__(self, interval=DEFAULT_WATCH_INTERVAL, on_reload=None):
+        self.interval = interval
+        self.on_reload = on_reload
+        self._lock = threading.Lock()
+        self._signatures = self._stat()
+        self._dataset = load_dataset()
+        self._checked = time.monotonic()
+
+    def _stat(self):
+        return {path: file_signature(path) for path in SUMMARY_TABLES.values()}
+
+    def current(self):
+        """The latest dataset; the CSVs are checked at most once per interval"""
+        if time.monotonic() - self._checked < self.interval:
+            return self._dataset
+
+        with self._lock:
+            if time.monotonic() - self._checked < self.interval:
+                return self._dataset
+            self._checked = time.monotonic()
+            try:
+                signatures = self._stat()
+                if signatures == self._signatures:
+                    return self._dataset
+                dataset = load_dataset(self._dataset)
+            except (OSError, ValueError, KeyError) as e:
+                # A file mid-copy fails to parse or its checks; keep serving the old data and retry
+                logger.warning("Keeping data version %s; reload failed: %s", self._dataset.version, e)
+                return self._dataset
+
+            self._signatures = signatures
+            if dataset is not self._dataset:
+                previous, self._dataset = self._dataset, dataset
+                if self.on_reload is not None:
+                    self.on_reload(previous, dataset)
+            return self._dataset
@@ -0,0 +1,395 @@
+"""Plotly figure builders for the pitcher dashboard.
+
+Every function takes plain frames or arrays and returns a go.Figure, so
+figures can be built and timed without Streamlit.
+"""
+import numpy as np
+import plotly.express as px
+import plotly.graph_objects as go
+
+from location_density import GRID_X_EDGES, GRID_Y_EDGES
+
+# Plotly theme configuration
+plotly_template = {
+    'layout': {
+        'paper_bgcolor': '#1a1d24',
+        'plot_bgcolor': '#1a1d24',
+        'font': {'color': '#e0e0e0', 'family': 'Inter, sans-serif'},
+        'xaxis': {
+            'gridcolor': '#333',
+            'linecolor': '#444',
+            'zerolinecolor': '#444'
+        },
+        'yaxis': {
+            'gridcolor': '#333',
+            'linecolor': '#444',
+            'zerolinecolor': '#444'
+        },
+        'title': {
+            'font': {'size': 18, 'color': '#ffffff'}
+        }
+    }
+}
+
+
+# Color map for pitch types
+pitch_color_map = {
+    'Fastball': '#FF6B6B',
+    'FourSeamFastBall': '#FF6B6B',
+    'TwoSeamFastBall': '#FF8C8C',
+    'Sinker': '#FFA07A',
+    'Cutter': '#FFD93D',
+    'Slider': '#6BCF7F',
+    'Curveball': '#4ECDC4',
+    'ChangeUp': '#95E1D3',
+    'Splitter': '#A8E6CF'
+}
+
+def pitch_colors(pitch_types):
+    """Map a column of pitch types to marker colors"""
+    return pitch_types.astype(str).map(pitch_color_map).fillna('#CCCCCC').to_numpy()
+
+# Helper function to create movement plot
+def create_movement_plot(pitch_data, title="Pitch Movement"):
+    """Create pitch movement plot showing break patterns"""
+    fig = go.Figure()
+    
+    pitch_types = pitch_data['TaggedPitchType'].astype(str).to_numpy()
+    counts = pitch_data['Pitch_Count'].to_numpy()
+    
+    # One trace for the whole arsenal; size is capped at 25 pixels
+    fig.add_trace(go.Scatter(
+        x=pitch_data['Avg_HorzBreak'].to_numpy(),
+        y=pitch_data['Avg_InducedVert'].to_numpy(),
+        mode='markers+text',
+        marker=dict(
+            size=np.minimum(8 + counts / 50, 25),
+            color=pitch_colors(pitch_data['TaggedPitchType']),
+            line=dict(color='white', width=2)
+        ),
+        text=pitch_types,
+        customdata=counts,
+        textposition='top center',
+        textfont=dict(size=10, color='white'),
+        hovertemplate=(
+            "<b>%{text}</b><br>" +
+            "Horizontal: %{x:.1~f}″<br>" +
+            "Vertical: %{y:.1~f}″<br>" +
+            "Count: %{customdata:d}<br>" +
+            "<extra></extra>"
+        )
+    ))
+    
+    # Add quadrant lines
+    fig.add_hline(y=0, line_dash="dash", line_color="#666", opacity=0.5)
+    fig.add_vline(x=0, line_dash="dash", line_color="#666", opacity=0.5)
+    
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        xaxis_title="Horizontal Break (inches)",
+        yaxis_title="Induced Vertical Break (inches)",
+        template=plotly_template,
+        showlegend=False,
+        height=500,
+        xaxis=dict(range=[-25, 25], zeroline=True),
+        yaxis=dict(range=[-25, 25], zeroline=True)
+    )
+    
+    return fig
+
+# Helper function to create percentile bars
+def create_percentile_plot(pitch_types, percentiles, title="League Percentiles by Pitch Type"):
+    """Create grouped percentile bars per metric, one color per pitch type"""
+    fig = go.Figure()
+    metrics = list(percentiles.columns)
+    
+    for pitch_type, values in zip(pitch_types, percentiles.to_numpy()):
+        fig.add_trace(go.Bar(
+            x=values,
+            y=metrics,
+            orientation='h',
+            name=pitch_type,
+            marker_color=pitch_color_map.get(pitch_type, '#CCCCCC'),
+            hovertemplate=f"<b>{pitch_type}</b><br>%{{y}}: %{{x:.0f}}th percentile<extra></extra>"
+        ))
+    
+    fig.add_vline(x=50, line_dash="dash", line_color="#666", opacity=0.7)
+    
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        barmode='group',
+        xaxis_title="Percentile within pitch type",
+        xaxis=dict(range=[0, 100]),
+        yaxis=dict(autorange='reversed'),
+        template=plotly_template,
+        height=max(400, 100 + 18 * len(metrics) * len(pitch_types))
+    )
+    
+    return fig
+
+# Helper function to draw the strike zone and home plate
+def add_strike_zone(fig):
+    """Overlay the strike zone outline and home plate on a location plot"""
+    # Draw strike zone (approximate MLB strike zone)
+    strike_zone_x = [-0.83, 0.83, 0.83, -0.83, -0.83]
+    strike_zone_y = [1.5, 1.5, 3.5, 3.5, 1.5]
+    
+    fig.add_trace(go.Scatter(
+        x=strike_zone_x,
+        y=strike_zone_y,
+        mode='lines',
+        line=dict(color='white', width=3),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+    
+    # Add home plate - ROTATED 180° FOR PITCHER'S VIEW
+    # Point of plate facing down/away (toward catcher)
+    # Base of plate at top (toward pitcher)
+    plate_x = [0.83, -0.83, -0.83, 0, 0.83]
+    plate_y = [-0.15, -0.15, 0.0, 0.15, 0.0]
+    
+    fig.add_trace(go.Scatter(
+        x=plate_x,
+        y=plate_y,
+        fill='toself',
+        fillcolor='rgba(255, 255, 255, 0.3)',
+        line=dict(color='white', width=2),
+        showlegend=False,
+        hoverinfo='skip'
+    ))
+
+# Helper function to create strike zone plot
+def create_strike_zone_plot(pitch_data, title="Pitch Location"):
+    """Create strike zone plot of average pitch locations"""
+    
+    # Check if we have location data
+    if 'PlateLocSide' not in pitch_data.columns or 'PlateLocHeight' not in pitch_data.columns:
+        # Return empty plot with message
+        fig = go.Figure()
+        fig.add_annotation(
+            text="Location data not available",
+            xref="paper", yref="paper",
+            x=0.5, y=0.5, showarrow=False,
+            font=dict(size=16, color="#888")
+        )
+        fig.update_layout(
+            template=plotly_template,
+            height=500,
+            xaxis=dict(visible=False),
+            yaxis=dict(visible=False)
+        )
+        return fig
+    
+    fig = go.Figure()
+    
+    # Plot each pitch type - NO FLIPPING, use data as-is
+    located = pitch_data[pitch_data['PlateLocSide'].notna() & pitch_data['PlateLocHeight'].notna()]
+    counts = located['Pitch_Count'].to_numpy()
+    
+    # Much smaller bubbles - max 20 pixels
+    fig.add_trace(go.Scatter(
+        x=located['PlateLocSide'].to_numpy(),
+        y=located['PlateLocHeight'].to_numpy(),
+        mode='markers',
+        marker=dict(
+            size=np.minimum(6 + counts / 60, 20),
+            color=pitch_colors(located['TaggedPitchType']),
+            opacity=0.7,
+            line=dict(color='white', width=1)
+        ),
+        text=located['TaggedPitchType'].astype(str).to_numpy(),
+        customdata=counts,
+        hovertemplate=(
+            "<b>%{text}</b><br>" +
+            "Horizontal: %{x:.2~f}<br>" +
+            "Height: %{y:.2~f}<br>" +
+            "Count: %{customdata:d}<br>" +
+            "<extra></extra>"
+        )
+    ))
+    
+    add_strike_zone(fig)
+    
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        xaxis_title="Horizontal Location (ft, pitcher's view)",
+        yaxis_title="Height (ft)",
+        template=plotly_template,
+        showlegend=False,
+        height=500,
+        xaxis=dict(range=[-2.5, 2.5], zeroline=False),
+        yaxis=dict(range=[-0.5, 4.5], zeroline=False, scaleanchor="x", scaleratio=1)
+    )
+    
+    return fig
+
+# Helper function to create location heat map
+def create_location_heatmap(grid, title="Pitch Location Density", league_grid=None):
+    """Create strike zone heat map from a precomputed location grid"""
+    x_centers = (GRID_X_EDGES[:-1] + GRID_X_EDGES[1:]) / 2
+    y_centers = (GRID_Y_EDGES[:-1] + GRID_Y_EDGES[1:]) / 2
+    share = grid / grid.sum() * 100
+    
+    if league_grid is not None:
+        # Difference from the league's share of pitches in each cell
+        z = share - league_grid / league_grid.sum() * 100
+        limit = max(np.abs(z).max(), 0.1)
+        heatmap = go.Heatmap(
+            x=x_centers, y=y_centers, z=z,
+            colorscale='RdBu_r', zmin=-limit, zmax=limit,
+            colorbar=dict(title="vs League (pp)"),
+            hovertemplate="Side: %{x:.1f}<br>Height: %{y:.1f}<br>vs League: %{z:+.1f} pp<extra></extra>"
+        )
+    else:
+        heatmap = go.Heatmap(
+            x=x_centers, y=y_centers, z=share,
+            colorscale='Inferno',
+            colorbar=dict(title="% of Pitches"),
+            hovertemplate="Side: %{x:.1f}<br>Height: %{y:.1f}<br>Share: %{z:.1f}%<extra></extra>"
+        )
+    
+    fig = go.Figure(heatmap)
+    add_strike_zone(fig)
+    
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        xaxis_title="Horizontal Location (ft, pitcher's view)",
+        yaxis_title="Height (ft)",
+        template=plotly_template,
+        showlegend=False,
+        height=500,
+        xaxis=dict(range=[-2.5, 2.5], zeroline=False),
+        yaxis=dict(range=[-0.5, 4.5], zeroline=False, scaleanchor="x", scaleratio=1)
+    )
+    
+    return fig
+
+# Helper function to create a histogram from precomputed bin counts
+def create_distribution_plot(counts, edges, title, x_title, color, league_counts=None):
+    """Create a histogram bar chart from server-side bin counts"""
+    centers = (edges[:-1] + edges[1:]) / 2
+    y_title = "count"
+    if league_counts is not None:
+        # Compare shapes as shares, since the league has far more pitchers than a team
+        counts = counts / max(counts.sum(), 1) * 100
+        league_counts = league_counts / max(league_counts.sum(), 1) * 100
+        y_title = "% of pitchers"
+    
+    fig = go.Figure(go.Bar(
+        x=centers,
+        y=counts,
+        width=np.diff(edges),
+        marker_color=color,
+        name="Team" if league_counts is not None else x_title,
+        hovertemplate=f"{x_title}: %{{x:.1f}}<br>{y_title}: %{{y:.3~f}}<extra></extra>"
+    ))
+    if league_counts is not None:
+        fig.add_trace(go.Scatter(
+            x=centers,
+            y=league_counts,
+            mode='lines',
+            line=dict(color='#e0e0e0', width=2, shape='hvh'),
+            name="League",
+            hovertemplate=f"{x_title}: %{{x:.1f}}<br>League: %{{y:.1f}}%<extra></extra>"
+        ))
+    
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        bargap=0,
+        showlegend=league_counts is not None
+    )
+    
+    return fig
+
+# Point counts at which the large scatter plots switch to WebGL markers, and then
+# to a server-side 2D histogram so the figure size stops growing with the filter
+WEBGL_POINT_THRESHOLD = 1000
+DENSITY_POINT_THRESHOLD = 5000
+DENSITY_BINS = 60
+
+def scatter_render_mode(n_points):
+    """'svg', 'webgl' or 'density' for a scatter plot of n_points markers"""
+    if n_points > DENSITY_POINT_THRESHOLD:
+        return 'density'
+    if n_points > WEBGL_POINT_THRESHOLD:
+        return 'webgl'
+    return 'svg'
+
+# Helper function to create a 2D histogram in place of a large scatter plot
+def create_density_plot(x, y, title, x_title, y_title, x_range=None, y_range=None, colorscale='Plasma'):
+    """Create a heat map of pitcher counts binned on the server"""
+    x = np.asarray(x, dtype='float64')
+    y = np.asarray(y, dtype='float64')
+    finite = np.isfinite(x) & np.isfinite(y)
+    x, y = x[finite], y[finite]
+    
+    if x_range is None:
+        x_range = (x.min(), x.max()) if len(x) else (0, 1)
+    if y_range is None:
+        y_range = (y.min(), y.max()) if len(y) else (0, 1)
+    counts, x_edges, y_edges = np.histogram2d(x, y, bins=DENSITY_BINS, range=[x_range, y_range])
+    
+    # Empty cells are left blank rather than drawn as zero
+    z = counts.T
+    z[z == 0] = np.nan
+    
+    fig = go.Figure(go.Heatmap(
+        x=(x_edges[:-1] + x_edges[1:]) / 2,
+        y=(y_edges[:-1] + y_edges[1:]) / 2,
+        z=z,
+        colorscale=colorscale,
+        colorbar=dict(title="Pitchers"),
+        hovertemplate=(
+            f"{x_title}: %{{x:.1f}}<br>" +
+            f"{y_title}: %{{y:.1f}}<br>" +
+            "Pitchers: %{z}<extra></extra>"
+        )
+    ))
+    
+    fig.update_layout(
+        title=f"<b>{title}</b>",
+        xaxis_title=x_title,
+        yaxis_title=y_title,
+        template=plotly_template,
+        height=600
+    )
+    
+    return fig
+
+# Helper function to create the Stuff+ vs Pitching+ matrix for a set of overall rows
+def create_performance_matrix(overall_rows, mode=None):
+    """Bubble chart of every pitcher, or a density plot once there are too many points"""
+    mode = mode or scatter_render_mode(len(overall_rows))
+    if mode == 'density':
+        fig_scatter = create_density_plot(
+            overall_rows['Overall_StuffPlus'],
+            overall_rows['Overall_PitchingPlus'],
+            "Stuff+ vs Pitching+",
+            "Stuff+",
+            "Pitching+"
+        )
+    else:
+        fig_scatter = px.scatter(
+            overall_rows,
+            x='Overall_StuffPlus',
+            y='Overall_PitchingPlus',
+            hover_data=['Pitcher', 'PitcherTeam', 'Total_Pitches'],
+            size='Total_Pitches',
+            color='Total_Pitches',
+            title="<b>Stuff+ vs Pitching+</b>",
+            labels={
+                'Overall_StuffPlus': 'Stuff+',
+                'Overall_PitchingPlus': 'Pitching+',
+                'Total_Pitches': 'Pitches'
+            },
+            color_continuous_scale='Plasma',
+            render_mode='webgl' if mode == 'webgl' else 'svg'
+        )
+    
+    fig_scatter.add_hline(y=100, line_dash="dash", line_color="#666", opacity=0.5)
+    fig_scatter.add_vline(x=100, line_dash="dash", line_color="#666", opacity=0.5)
+    fig_scatter.update_layout(template=plotly_template, height=600)
+    return fig_scatter
@@ -0,0 +1,174 @@
+"""Server-side pitcher name search.
+
+Names are normalized (accents stripped, lower-cased, whitespace trimmed and
+collapsed) and kept in sorted lists of full names and of the names from their
+second word on, so "hunter b" and "bell" both find "Hunter Bell" with a binary
+search. When nothing matches as a prefix, candidates are scored with difflib
+so a one-word typo like "smtih" still finds "Aiden Smith". A team-limited
+search scores every full name of the team's pitchers and each of its words; a
+league-wide one scores only the few distinct names and words sharing the
+largest share of their trigrams with the query, counted with numpy.
+"""
+import difflib
+import unicodedata
+from bisect import bisect_left
+
+import numpy as np
+
+DEFAULT_LIMIT = 20
+FUZZY_CUTOFF = 0.75
+# League-wide fuzzy searches score at most this many names and words with difflib
+FUZZY_CANDIDATES = 24
+
+
+def normalize_name(name):
+    """Lower-case, accent-free name with single spaces"""
+    name = unicodedata.normalize('NFKD', str(name))
+    name = ''.join(c for c in name if not unicodedata.combining(c))
+    return ' '.join(name.lower().split())
+
+
+def _trigrams(name):
+    padded = f'  {name} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _similarity(matcher, name, words=True):
+    """Best difflib ratio of the matcher's query against the full name or any single word of it
+
+    The cheap upper bounds skip the full ratio for strings that cannot reach the cutoff.
+    """
+    best = 0.0
+    texts = ([name] + name.split(' ')) if words else [name]
+    for text in texts:
+        matcher.set_seq1(text)
+        for bound in (matcher.real_quick_ratio, matcher.quick_ratio, matcher.ratio):
+            ratio = bound()
+            if ratio < FUZZY_CUTOFF or ratio <= best:
+                break
+        else:
+            best = ratio
+    return best
+
+
+class _PrefixList:
+    """Sorted (key, pitcher ID) pairs searched by binary search"""
+
+    def __init__(self, pairs):
+        pairs = sorted(pairs)
+        self._keys = [key for key, _ in pairs]
+        self._pids = [pid for _, pid in pairs]
+
+    def matches(self, prefix):
+        start = bisect_left(self._keys, prefix)
+        stop = bisect_left(self._keys, prefix + '\uffff', lo=start)
+        return self._pids[start:stop]
+
+
+class PitcherSearchIndex:
+    """Prefix and fuzzy lookup from typed text to pitcher IDs"""
+
+    def __init__(self, labels):
+        # labels: pitcher ID -> (name, team)
+        self._teams = {pid: team for pid, (_, team) in labels.items()}
+        self._normalized = {pid: normalize_name(name) for pid, (name, _) in labels.items()}
+
+        # Full names first, then names from their second word on ("bell" -> "Hunter Bell")
+        self._full = _PrefixList((name, pid) for pid, name in self._normalized.items())
+        self._later = _PrefixList(
+            (' '.join(words[i:]), pid)
+            for pid, words in ((pid, name.split(' ')) for pid, name in self._normalized.items())
+            for i in range(1, len(words))
+        )
+
+        # Trigram postings over the distinct full names and words for the fuzzy fallback
+        self._by_name = {}
+        for pid, name in self._normalized.items():
+            self._by_name.setdefault(name, []).append(pid)
+        text_names = {}
+        for name in self._by_name:
+            for text in {name, *name.split(' ')}:
+                text_names.setdefault(text, []).append(name)
+        self._texts = sorted(text_names)
+        self._text_names = [text_names[text] for text in self._texts]
+        postings = {}
+        gram_counts = []
+        for i, text in enumerate(self._texts):
+            grams = _trigrams(text)
+            gram_counts.append(len(grams))
+            for gram in grams:
+                postings.setdefault(gram, []).append(i)
+        self._text_gram_counts = np.array(gram_counts, dtype='float64')
+        self._trigram_texts = {gram: np.array(ids, dtype='int32') for gram, ids in postings.items()}
+
+        # Sorted pitcher IDs per team for team-limited searches
+        self.team_pitchers = {}
+        for pid in sorted(labels, key=lambda pid: (self._normalized[pid], pid)):
+            self.team_pitchers.setdefault(self._teams[pid], []).append(pid)
+
+    def _candidate_texts(self, query):
+        """Positions in _texts of the names and words with the most trigram overlap, best first"""
+        grams = _trigrams(query)
+        postings = [self._trigram_texts[gram] for gram in grams if gram in self._trigram_texts]
+        if not postings:
+            return []
+        shared = np.bincount(np.concatenate(postings), minlength=len(self._texts))
+        # Shared trigrams relative to both lengths, so long names don't win on size alone
+        overlap = shared / (len(grams) + self._text_gram_counts)
+        k = min(FUZZY_CANDIDATES, int(np.count_nonzero(shared)))
+        top = np.argpartition(-overlap, k - 1)[:k]
+        return top[np.lexsort((top, -overlap[top]))].tolist()
+
+    def _fuzzy(self, query, team=None):
+        """Names closest to the query, among a team's names or the trigram candidates"""
+        matcher = difflib.SequenceMatcher(None, '', query)
+        best = {}
+        if team is not None:
+            # Filter by team first; a single team is small enough to score every name
+            for name in {self._normalized[pid] for pid in self.team_pitchers.get(team, [])}:
+                ratio = _similarity(matcher, name)
+                if ratio >= FUZZY_CUTOFF:
+                    best[name] = ratio
+        else:
+            # Each candidate is a full name or a single word, scored once for every name it is in
+            for i in self._candidate_texts(query):
+                ratio = _similarity(matcher, self._texts[i], words=False)
+                if ratio < FUZZY_CUTOFF:
+                    continue
+                for name in self._text_names[i]:
+                    if ratio > best.get(name, 0.0):
+                        best[name] = ratio
+        return sorted(best, key=lambda name: (-best[name], name))
+
+    def search(self, query, team=None, limit=DEFAULT_LIMIT):
+        """Up to limit pitcher IDs matching the query, best first"""
+        query = normalize_name(query)
+        if not query:
+            return []
+
+        results = []
+        seen = set()
+
+        def add(pid):
+            if pid not in seen and (team is None or self._teams[pid] == team):
+                seen.add(pid)
+                results.append(pid)
+
+        if team is not None:
+            # A single team is small enough to scan
+            for pid in self.team_pitchers.get(team, []):
+                if (' ' + query) in (' ' + self._normalized[pid]):
+                    add(pid)
+        else:
+            for matches in (self._full.matches(query), self._later.matches(query)):
+                for pid in matches[:limit]:
+                    add(pid)
+                if len(results) >= limit:
+                    return results[:limit]
+
+        # Typos only: any prefix match means the user is on the right track
+        if not results and len(query) >= 3:
+            for name in self._fuzzy(query, team):
+                for pid in self._by_name[name]:
+                    add(pid)
+        return results[:limit]
@@ -0,0 +1,268 @@
+"""Build the pitcher summary tables from the raw pitch file.
+
+The raw CSV is streamed in chunks and reduced to running sums, non-null counts
+and pitch counts per (pitcher, team, pitch type). Both summary CSVs are
+derived from those totals: pitch type averages are sum / count, and overall
+averages pool the sums across a pitcher's pitch types, so they are the mean
+over all of the pitcher's pitches.
+
+The totals and the GameIDs already folded in are kept in a state directory.
+Later runs only aggregate rows from new games and add them to the saved
+totals, so a weekend's games don't mean reprocessing the season. Rows without
+a GameID can't be tracked that way, so they are re-aggregated on every run and
+never saved.
+
+Usage:
+    python summary_builder.py pitching_2025.csv
+    python summary_builder.py pitching_2025.csv --full
+    python summary_builder.py pitching_2025.csv --pitch-type-out pt.csv --overall-out overall.csv
+"""
+import argparse
+import json
+import os
+
+import pandas as pd
+
+from pitch_store import RAW_PITCH_FILE
+from summary_snapshot import OVERALL_COLUMNS, OVERALL_SUMMARY_FILE, PITCH_TYPE_COLUMNS, PITCH_TYPE_SUMMARY_FILE
+
+SUMMARY_STATE_DIR = 'summary_state'
+STATE_TOTALS_FILE = 'totals.parquet'
+STATE_META_FILE = 'state.json'
+CHUNK_ROWS = 500_000
+
+SUMMARY_KEYS = ['Pitcher', 'PitcherTeam', 'TaggedPitchType']
+PITCHER_KEYS = ['Pitcher', 'PitcherTeam']
+GAME_COLUMN = 'GameID'
+
+# Per-pitch ratings; when the raw file lacks them they are carried over from
+# the summaries already on disk
+RATING_COLUMNS = ['StuffPlus', 'PitchingPlus']
+
+# Pitch type summary column -> raw column it averages. Ratings are averaged
+# from the per-pitch StuffPlus/PitchingPlus scores
+PITCH_TYPE_AVERAGES = {
+    'StuffPlus': 'StuffPlus',
+    'PitchingPlus': 'PitchingPlus',
+    'Avg_Velocity': 'RelSpeed',
+    'Avg_InducedVert': 'InducedVertBreak',
+    'Avg_HorzBreak': 'HorzBreak',
+    'Avg_SpinRate': 'SpinRate',
+    'Avg_Extension': 'Extension',
+    'Avg_RelHeight': 'RelHeight',
+    'Avg_RelSide': 'RelSide'
+}
+
+# Overall summary column -> pitch type summary column whose totals it pools
+OVERALL_AVERAGES = {
+    'Overall_StuffPlus': 'StuffPlus',
+    'Overall_PitchingPlus': 'PitchingPlus',
+    'Avg_Velocity': 'Avg_Velocity',
+    'Avg_Extension': 'Avg_Extension'
+}
+
+
+def _sum_col(col):
+    return col + '_sum'
+
+
+def _count_col(col):
+    return col + '_n'
+
+
+def aggregate_chunk(chunk):
+    """Sums, non-null counts and pitch counts per summary key for one chunk"""
+    chunk = chunk.dropna(subset=SUMMARY_KEYS)
+    columns = {key: chunk[key].astype(str) for key in SUMMARY_KEYS}
+    for col, raw_col in PITCH_TYPE_AVERAGES.items():
+        if raw_col in chunk:
+            values = pd.to_numeric(chunk[raw_col], errors='coerce')
+        else:
+            values = pd.Series(float('nan'), index=chunk.index)
+        columns[_sum_col(col)] = values.fillna(0.0)
+        columns[_count_col(col)] = values.notna().astype('int64')
+    columns['Pitch_Count'] = pd.Series(1, index=chunk.index, dtype='int64')
+    return pd.DataFrame(columns).groupby(SUMMARY_KEYS, sort=False).sum()
+
+
+def combine_totals(*totals):
+    """Add totals frames key by key"""
+    totals = [t for t in totals if t is not None and len(t)]
+    if not totals:
+        return None
+    if len(totals) == 1:
+        return totals[0]
+    return pd.concat(totals).groupby(level=SUMMARY_KEYS, sort=False).sum()
+
+
+def stream_totals(csv_path=RAW_PITCH_FILE, skip_games=(), chunk_rows=CHUNK_ROWS):
+    """Totals for new games, totals for pitches without a GameID, and the GameIDs seen
+
+    Pitches from games in skip_games are left out.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    raw_columns = set(PITCH_TYPE_AVERAGES.values()) | {GAME_COLUMN}
+    usecols = SUMMARY_KEYS + [col for col in header if col in raw_columns]
+    dtypes = {key: str for key in SUMMARY_KEYS}
+    if GAME_COLUMN in header:
+        dtypes[GAME_COLUMN] = str
+
+    skip_games = set(skip_games)
+    games = set()
+    totals = untracked = None
+    for chunk in pd.read_csv(csv_path, usecols=usecols, dtype=dtypes, chunksize=chunk_rows):
+        if GAME_COLUMN not in chunk:
+            untracked = combine_totals(untracked, aggregate_chunk(chunk))
+            continue
+        no_game = chunk[GAME_COLUMN].isna()
+        if no_game.any():
+            untracked = combine_totals(untracked, aggregate_chunk(chunk[no_game]))
+            chunk = chunk[~no_game]
+        if skip_games:
+            chunk = chunk[~chunk[GAME_COLUMN].isin(skip_games)]
+        games.update(chunk[GAME_COLUMN].unique().tolist())
+        if len(chunk):
+            totals = combine_totals(totals, aggregate_chunk(chunk))
+    return totals, untracked, games
+
+
+def _averages(totals, columns):
+    """Column -> sum / count for the given (output column, totals column) pairs"""
+    averages = {}
+    for col, source in columns.items():
+        counts = totals[_count_col(source)]
+        averages[col] = (totals[_sum_col(source)] / counts.where(counts > 0)).round(1)
+    return averages
+
+
+def summarize_totals(totals):
+    """Pitch type and overall summary tables from running totals"""
+    pitch_type = pd.DataFrame(
+        {'Pitch_Count': totals['Pitch_Count'],
+         **_averages(totals, {col: col for col in PITCH_TYPE_AVERAGES})}
+    ).reset_index()
+    pitch_type = pitch_type.sort_values(
+        ['Pitcher', 'PitcherTeam', 'Pitch_Count'], ascending=[True, True, False], kind='stable'
+    )[PITCH_TYPE_COLUMNS]
+
+    pitcher_totals = totals.groupby(level=PITCHER_KEYS, sort=False).sum()
+    overall = pd.DataFrame(
+        {'Total_Pitches': pitcher_totals['Pitch_Count'],
+         'Num_Pitch_Types': totals.groupby(level=PITCHER_KEYS, sort=False).size(),
+         **_averages(pitcher_totals, OVERALL_AVERAGES)}
+    ).reset_index()
+    overall = overall.sort_values('Overall_PitchingPlus', ascending=False, kind='stable')[OVERALL_COLUMNS]
+
+    return pitch_type.reset_index(drop=True), overall.reset_index(drop=True)
+
+
+def load_state(state_dir=SUMMARY_STATE_DIR):
+    """Saved totals and processed GameIDs, or (None, empty set)"""
+    try:
+        with open(os.path.join(state_dir, STATE_META_FILE)) as f:
+            meta = json.load(f)
+        totals = pd.read_parquet(os.path.join(state_dir, STATE_TOTALS_FILE))
+    except (FileNotFoundError, ValueError):
+        return None, set()
+    return totals.set_index(SUMMARY_KEYS), set(meta.get('games', []))
+
+
+def save_state(totals, games, state_dir=SUMMARY_STATE_DIR):
+    os.makedirs(state_dir, exist_ok=True)
+    totals_path = os.path.join(state_dir, STATE_TOTALS_FILE)
+    meta_path = os.path.join(state_dir, STATE_META_FILE)
+    totals.reset_index().to_parquet(totals_path + '.tmp', index=False)
+    os.replace(totals_path + '.tmp', totals_path)
+    with open(meta_path + '.tmp', 'w') as f:
+        json.dump({'games': sorted(games)}, f)
+    os.replace(meta_path + '.tmp', meta_path)
+
+
+def carry_ratings(pitch_type, overall, pitch_type_path, overall_path, missing):
+    """Replace the rating columns in missing with the values in the existing summary CSVs"""
+    overall_missing = [col for col, source in OVERALL_AVERAGES.items() if source in missing]
+    dtypes = {key: str for key in SUMMARY_KEYS}
+    try:
+        old_pitch_type = pd.read_csv(pitch_type_path, usecols=SUMMARY_KEYS + missing, dtype=dtypes)
+        old_overall = pd.read_csv(overall_path, usecols=PITCHER_KEYS + overall_missing, dtype=dtypes)
+    except (FileNotFoundError, ValueError):
+        return None
+
+    pitch_type = pitch_type.drop(columns=missing).merge(old_pitch_type, on=SUMMARY_KEYS, how='left')
+    overall = overall.drop(columns=overall_missing).merge(old_overall, on=PITCHER_KEYS, how='left')
+    overall = overall.sort_values('Overall_PitchingPlus', ascending=False, kind='stable')
+    return pitch_type[PITCH_TYPE_COLUMNS], overall[OVERALL_COLUMNS].reset_index(drop=True)
+
+
+def _write_csv(df, path):
+    # Replace atomically so the dashboard never snapshots a half-written file
+    df.to_csv(path + '.tmp', index=False)
+    os.replace(path + '.tmp', path)
+
+
+def build_summaries(csv_path=RAW_PITCH_FILE,
+                    pitch_type_path=PITCH_TYPE_SUMMARY_FILE,
+                    overall_path=OVERALL_SUMMARY_FILE,
+                    state_dir=SUMMARY_STATE_DIR,
+                    full=False,
+                    chunk_rows=CHUNK_ROWS):
+    """Fold new games into the saved totals and rewrite both summary CSVs
+
+    Returns the number of new games, or None when the raw file has no GameID
+    column and the whole file was aggregated.
+    """
+    header = pd.read_csv(csv_path, nrows=0).columns
+    has_games = GAME_COLUMN in header
+    saved, processed = (None, set()) if full or not has_games else load_state(state_dir)
+
+    new_totals, untracked, games = stream_totals(csv_path, processed, chunk_rows)
+    totals = combine_totals(saved, new_totals)
+    season = combine_totals(totals, untracked)
+    if season is None:
+        raise ValueError(f"No pitches with {', '.join(SUMMARY_KEYS)} found in {csv_path}")
+
+    pitch_type, overall = summarize_totals(season)
+    missing = [col for col in RATING_COLUMNS if col not in header]
+    if missing:
+        carried = carry_ratings(pitch_type, overall, pitch_type_path, overall_path, missing)
+        if carried is None:
+            raise ValueError(
+                f"{csv_path} has no per-pitch {', '.join(missing)} column and there are no "
+                f"existing summaries to carry the ratings over from"
+            )
+        pitch_type, overall = carried
+    _write_csv(pitch_type, pitch_type_path)
+    _write_csv(overall, overall_path)
+
+    if not has_games:
+        return None
+    if totals is not None:
+        save_state(totals, processed | games, state_dir)
+    return len(games)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the pitcher summary CSVs from raw pitches")
+    parser.add_argument('csv', nargs='?', default=RAW_PITCH_FILE, help="Raw pitch CSV")
+    parser.add_argument('--pitch-type-out', default=PITCH_TYPE_SUMMARY_FILE, help="Pitch type summary CSV to write")
+    parser.add_argument('--overall-out', default=OVERALL_SUMMARY_FILE, help="Overall summary CSV to write")
+    parser.add_argument('--state', default=SUMMARY_STATE_DIR, help="Running totals directory")
+    parser.add_argument('--full', action='store_true', help="Ignore saved totals and rebuild the season")
+    parser.add_argument('--chunk-rows', type=int, default=CHUNK_ROWS, help="Rows read per chunk")
+    args = parser.parse_args()
+
+    try:
+        new_games = build_summaries(
+            args.csv, args.pitch_type_out, args.overall_out,
+            state_dir=args.state, full=args.full, chunk_rows=args.chunk_rows
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if new_games is None:
+        print(f"No {GAME_COLUMN} column; rebuilt the summaries from every pitch in {args.csv}")
+    else:
+        print(f"Folded in {new_games:,} new games from {args.csv}")
+
+
+if __name__ == '__main__':
+    main()
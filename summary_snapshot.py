@@ -0,0 +1,161 @@
+"""Binary snapshots of the pitcher summary tables.
+
+Each summary CSV is parsed once into a Feather (Arrow IPC) snapshot with
+categorical name/team/pitch type columns and float32 metrics. Later loads read
+the snapshot directly and only re-parse the CSV when its size, mtime and
+content hash no longer match the ones recorded with the snapshot.
+
+A CSV is checked before its snapshot is written: one that is missing columns,
+ends mid-row or has rows without keys or pitch counts (a file caught mid-copy)
+raises ValueError and leaves the previous snapshot in place.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+import pyarrow.feather as feather
+
+from pitch_store import file_signature
+
+PITCH_TYPE_SUMMARY_FILE = 'pitcher_pitch_type_summary_2025.csv'
+OVERALL_SUMMARY_FILE = 'pitcher_overall_summary_2025.csv'
+SNAPSHOT_DIR = 'snapshots'
+
+CATEGORY_COLUMNS = ['Pitcher', 'PitcherTeam', 'TaggedPitchType']
+COUNT_COLUMNS = ['Pitch_Count', 'Total_Pitches', 'Num_Pitch_Types']
+
+# Columns each summary table must have
+PITCH_TYPE_COLUMNS = [
+    'Pitcher', 'PitcherTeam', 'TaggedPitchType', 'StuffPlus', 'PitchingPlus', 'Pitch_Count',
+    'Avg_Velocity', 'Avg_InducedVert', 'Avg_HorzBreak', 'Avg_SpinRate', 'Avg_Extension',
+    'Avg_RelHeight', 'Avg_RelSide'
+]
+OVERALL_COLUMNS = [
+    'Pitcher', 'PitcherTeam', 'Overall_StuffPlus', 'Overall_PitchingPlus', 'Total_Pitches',
+    'Num_Pitch_Types', 'Avg_Velocity', 'Avg_Extension'
+]
+
+
+def file_hash(path):
+    """Content hash of a source file"""
+    digest = hashlib.sha1()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _ends_with_newline(path):
+    with open(path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        if f.tell() == 0:
+            return False
+        f.seek(-1, os.SEEK_END)
+        return f.read(1) == b'\n'
+
+
+def read_summary_csv(csv_path, columns=None):
+    """Parse a summary CSV into compact dtypes, checking it has the given columns"""
+    if not _ends_with_newline(csv_path):
+        raise ValueError(f"{csv_path} does not end with a complete row")
+    df = pd.read_csv(csv_path)
+    missing = [col for col in columns or [] if col not in df.columns]
+    if missing:
+        raise ValueError(f"{csv_path} is missing columns {', '.join(missing)}")
+    required = [col for col in df.columns if col in CATEGORY_COLUMNS or col in COUNT_COLUMNS]
+    if df[required].isna().any(axis=None):
+        raise ValueError(f"{csv_path} has rows without a pitcher, team, pitch type or pitch count")
+
+    for col in df.columns:
+        if col in CATEGORY_COLUMNS:
+            df[col] = df[col].astype('category')
+        elif col in COUNT_COLUMNS:
+            df[col] = df[col].astype('int32')
+        elif pd.api.types.is_float_dtype(df[col]):
+            df[col] = df[col].astype('float32')
+    return df
+
+
+def _snapshot_paths(csv_path, snapshot_dir):
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return (
+        os.path.join(snapshot_dir, name + '.feather'),
+        os.path.join(snapshot_dir, name + '.json')
+    )
+
+
+def _replace(path, write, mode='wb'):
+    """Write through a uniquely named temporary file in the same directory, then swap it in
+
+    Each writer gets its own temporary file, so concurrent server processes
+    neither read a partial file nor write into each other's.
+    """
+    with tempfile.NamedTemporaryFile(mode, dir=os.path.dirname(path) or '.', suffix='.tmp', delete=False) as f:
+        temp_path = f.name
+        try:
+            write(f)
+        except BaseException:
+            f.close()
+            os.remove(temp_path)
+            raise
+    os.replace(temp_path, path)
+
+
+def write_snapshot(csv_path, snapshot_dir=SNAPSHOT_DIR, columns=None):
+    """Parse and check the CSV, then write its snapshot plus source metadata"""
+    df = read_summary_csv(csv_path, columns)
+    data_path, meta_path = _snapshot_paths(csv_path, snapshot_dir)
+    os.makedirs(snapshot_dir, exist_ok=True)
+
+    meta = {'source': file_signature(csv_path), 'sha1': file_hash(csv_path)}
+    _replace(data_path, lambda f: feather.write_feather(df, f, compression='uncompressed'))
+    _replace(meta_path, lambda f: json.dump(meta, f), 'w')
+
+    return df
+
+
+def load_summary(csv_path, snapshot_dir=SNAPSHOT_DIR, columns=None):
+    """Load a summary table from its snapshot, rebuilding it when the CSV changed"""
+    data_path, meta_path = _snapshot_paths(csv_path, snapshot_dir)
+    signature = file_signature(csv_path)
+
+    try:
+        with open(meta_path) as f:
+            meta = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return write_snapshot(csv_path, snapshot_dir, columns)
+
+    if meta.get('source') != signature:
+        # Touched but unchanged files only need their metadata refreshed
+        if meta.get('sha1') != file_hash(csv_path):
+            return write_snapshot(csv_path, snapshot_dir, columns)
+        meta['source'] = signature
+        _replace(meta_path, lambda f: json.dump(meta, f), 'w')
+
+    try:
+        return feather.read_feather(data_path, memory_map=True)
+    except (FileNotFoundError, OSError):
+        return write_snapshot(csv_path, snapshot_dir, columns)
+
+
+def snapshot_version(csv_path, snapshot_dir=SNAPSHOT_DIR):
+    """Short content hash of the CSV behind the current snapshot, or None"""
+    _, meta_path = _snapshot_paths(csv_path, snapshot_dir)
+    try:
+        with open(meta_path) as f:
+            return json.load(f)['sha1'][:12]
+    except (FileNotFoundError, ValueError, KeyError):
+        return None
+
+
+def load_summaries(pitch_type_path=PITCH_TYPE_SUMMARY_FILE,
+                   overall_path=OVERALL_SUMMARY_FILE,
+                   snapshot_dir=SNAPSHOT_DIR):
+    """Load the pitch type and overall summary tables in parallel"""
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pitch_type_future = pool.submit(load_summary, pitch_type_path, snapshot_dir, PITCH_TYPE_COLUMNS)
+        overall_future = pool.submit(load_summary, overall_path, snapshot_dir, OVERALL_COLUMNS)
+        return pitch_type_future.result(), overall_future.result()
@@ -0,0 +1,378 @@
+"""Synthetic pitching seasons for scale testing.
+
+A SeasonModel is fitted from a season's summary tables:
+
+- every real pitcher is an arsenal template (pitch types, usage shares, total
+  pitches, handedness, release point and which pitch types were tracked)
+- each pitch type's shape and ratings follow a multivariate normal fitted on
+  arm-side mirrored averages, so velocity, movement, spin and Stuff+/Pitching+
+  keep their correlations
+- team sizes are drawn from the real roster sizes
+
+A synthetic pitcher copies a random template's arsenal and release point,
+jitters its pitch count (keeping the long tail), draws fresh pitch shapes
+and shares one velocity offset across its pitches. Raw pitches scatter
+around those averages with typical pitch-to-pitch spreads.
+
+Pitchers are generated in fixed-size blocks, each seeded from (seed, block),
+so memory stays bounded by one block plus the per-pitcher summary totals, and
+a seed always gives the same files whatever the season size. The raw pitches
+are written as CSV or Parquet a block at a time, and the two summary CSVs are
+built from them with summary_builder, so they agree exactly with the raw file.
+
+Usage:
+    python synthetic_season.py --pitches 10000000 --out synthetic --season 2030
+    python synthetic_season.py --pitches 50000000 --format parquet --seed 7
+"""
+import argparse
+import math
+import os
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pa_csv
+import pyarrow.parquet as pq
+
+from pitch_similarity import SIMILARITY_FEATURES, pitch_features
+from summary_builder import PITCH_TYPE_AVERAGES, aggregate_chunk, summarize_totals
+from summary_snapshot import OVERALL_SUMMARY_FILE, PITCH_TYPE_SUMMARY_FILE
+
+DEFAULT_PITCHES = 1_000_000
+DEFAULT_SEED = 2025
+DEFAULT_SEASON = 'synthetic'
+PITCHERS_PER_BLOCK = 1000
+
+RAW_FILE_PATTERN = 'pitching_{season}.{extension}'
+PITCH_TYPE_FILE_PATTERN = 'pitcher_pitch_type_summary_{season}.csv'
+OVERALL_FILE_PATTERN = 'pitcher_overall_summary_{season}.csv'
+RAW_FORMATS = {'csv': 'csv', 'parquet': 'parquet'}
+# Raw measurements are rounded to this many decimals, like tracking exports
+RAW_DECIMALS = 2
+
+# Summary columns drawn per pitch type: shape (arm-side mirrored) and ratings
+RATING_COLUMNS = ['StuffPlus', 'PitchingPlus']
+DRAWN_COLUMNS = SIMILARITY_FEATURES + RATING_COLUMNS
+RELEASE_COLUMNS = ['Avg_Extension', 'Avg_RelHeight', 'Avg_RelSide']
+MIRRORED_COLUMNS = ['Avg_HorzBreak', 'Avg_RelSide']
+UNTRACKED_COLUMNS = SIMILARITY_FEATURES
+
+# Pitch types need this many tracked rows for their own fit; rarer ones use the pooled fit
+MIN_FIT_ROWS = 30
+MIN_FIT_PITCHES = 20
+# Share of a pitcher's velocity variance that is common to all of their pitch types
+ARM_VELOCITY_WEIGHT = 0.6
+# Log-scale jitter on a template's pitch count, and spread of release points between pitch types
+TOTAL_JITTER = 0.25
+RELEASE_JITTER = 0.05
+
+# Typical pitch-to-pitch standard deviation around a pitcher's pitch type averages;
+# the summaries only carry averages, so these are fixed rather than fitted
+RAW_SPREAD = {
+    'Avg_Velocity': 1.0,
+    'Avg_InducedVert': 2.0,
+    'Avg_HorzBreak': 2.0,
+    'Avg_SpinRate': 60.0,
+    'Avg_Extension': 0.15,
+    'Avg_RelHeight': 0.1,
+    'Avg_RelSide': 0.1,
+    'StuffPlus': 15.0,
+    'PitchingPlus': 20.0
+}
+PLATE_SIDE = (0.0, 0.8)
+PLATE_HEIGHT = (2.3, 0.75)
+GAMES_PER_TEAM = 56
+PITCHES_PER_OUTING = 60
+
+RAW_COLUMNS = [
+    'PitchNo', 'GameID', 'Pitcher', 'PitcherTeam', 'TaggedPitchType',
+    *[PITCH_TYPE_AVERAGES[col] for col in SIMILARITY_FEATURES],
+    'PlateLocSide', 'PlateLocHeight', *[PITCH_TYPE_AVERAGES[col] for col in RATING_COLUMNS]
+]
+
+
+def _weighted_mean(values, weights, codes, n):
+    """Per-code mean of values weighted by weights, ignoring NaN values"""
+    finite = np.isfinite(values)
+    sums = np.bincount(codes[finite], weights=(values * weights)[finite], minlength=n)
+    totals = np.bincount(codes[finite], weights=weights[finite], minlength=n)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return sums / totals
+
+
+class SeasonModel:
+    """Arsenal templates and pitch type distributions fitted from a real season"""
+
+    def __init__(self, pitch_type_df, overall_df):
+        pitch_type_df = pitch_type_df.sort_values(['PitcherTeam', 'Pitcher'], kind='stable').reset_index(drop=True)
+        codes = pitch_type_df.groupby(['PitcherTeam', 'Pitcher'], sort=False, observed=True).ngroup().to_numpy()
+        n_templates = codes.max() + 1
+        counts = pitch_type_df['Pitch_Count'].to_numpy(dtype='float64')
+
+        # Arsenal templates: each real pitcher's rows are contiguous
+        self.template_starts = np.searchsorted(codes, np.arange(n_templates + 1))
+        self.template_totals = np.bincount(codes, weights=counts, minlength=n_templates)
+        self.row_shares = counts / self.template_totals[codes]
+        self.row_types, self.pitch_types = pd.factorize(pitch_type_df['TaggedPitchType'].astype(str).to_numpy())
+        self.row_tracked = np.isfinite(pitch_type_df[UNTRACKED_COLUMNS].to_numpy(dtype='float64')).all(axis=1)
+
+        # Handedness and release point per template, from pitch-weighted averages
+        rel_side = _weighted_mean(
+            pitch_type_df['Avg_RelSide'].to_numpy(dtype='float64'), counts, codes, n_templates
+        )
+        self.template_hands = np.where(rel_side < 0, -1.0, 1.0)
+        features = pitch_features(pitch_type_df)
+        self.template_release = np.column_stack([
+            _weighted_mean(features[:, SIMILARITY_FEATURES.index(col)], counts, codes, n_templates)
+            for col in RELEASE_COLUMNS
+        ])
+
+        # Shape and rating distribution per pitch type, on arm-side mirrored values
+        drawn = np.column_stack([features, pitch_type_df[RATING_COLUMNS].to_numpy(dtype='float64')])
+        fit_rows = np.isfinite(drawn).all(axis=1) & (counts >= MIN_FIT_PITCHES)
+        pooled = (drawn[fit_rows].mean(axis=0), np.cov(drawn[fit_rows], rowvar=False))
+        self.type_fits = []
+        for code in range(len(self.pitch_types)):
+            rows = fit_rows & (self.row_types == code)
+            if rows.sum() >= MIN_FIT_ROWS:
+                self.type_fits.append((drawn[rows].mean(axis=0), np.cov(drawn[rows], rowvar=False)))
+            else:
+                self.type_fits.append(pooled)
+
+        # Roster sizes and the name pools synthetic pitchers are named from
+        self.team_sizes = overall_df.groupby('PitcherTeam', observed=True).size().to_numpy()
+        self.teams = sorted(overall_df['PitcherTeam'].astype(str).unique().tolist())
+        names = overall_df['Pitcher'].astype(str).str.strip().str.split(' ', n=1)
+        full = names[names.str.len() == 2]
+        self.first_names = sorted(set(full.str[0]))
+        self.last_names = sorted(set(full.str[1]))
+
+    @classmethod
+    def from_csv(cls, pitch_type_path=PITCH_TYPE_SUMMARY_FILE, overall_path=OVERALL_SUMMARY_FILE):
+        return cls(pd.read_csv(pitch_type_path), pd.read_csv(overall_path))
+
+    def expected_pitches_per_pitcher(self):
+        return self.template_totals.mean() * math.exp(TOTAL_JITTER ** 2 / 2)
+
+    def roster(self, n_pitchers, rng):
+        """Team and unique-within-team name for each of n_pitchers"""
+        sizes = []
+        assigned = 0
+        while assigned < n_pitchers:
+            sizes.append(int(rng.choice(self.team_sizes)))
+            assigned += sizes[-1]
+        sizes[-1] -= assigned - n_pitchers
+
+        base_teams = rng.permutation(self.teams).tolist()
+        teams = [
+            base_teams[i % len(base_teams)] + ('' if i < len(base_teams) else f'_{i // len(base_teams) + 1}')
+            for i in range(len(sizes))
+        ]
+        team_names = np.repeat(np.array(teams, dtype=object), sizes)
+
+        firsts = rng.integers(len(self.first_names), size=n_pitchers)
+        lasts = rng.integers(len(self.last_names), size=n_pitchers)
+        names = []
+        taken = set()
+        for team, first, last in zip(team_names.tolist(), firsts.tolist(), lasts.tolist()):
+            name = f'{self.first_names[first]} {self.last_names[last]}'
+            while (team, name) in taken:
+                name = f'{self.first_names[rng.integers(len(self.first_names))]} {self.last_names[last]}'
+            taken.add((team, name))
+            names.append(name)
+        return np.array(names, dtype=object), team_names, np.repeat(np.arange(len(sizes)), sizes)
+
+    def pitch_type_rows(self, n_pitchers, rng):
+        """Per pitch type plan for a block of pitchers
+
+        Returns the pitcher (0..n_pitchers-1), pitch type code, pitch count,
+        tracked flag and arm-side mirrored averages of every row, plus each
+        pitcher's handedness.
+        """
+        templates = rng.integers(len(self.template_totals), size=n_pitchers)
+        totals = np.maximum(
+            1, np.round(self.template_totals[templates] * rng.lognormal(0.0, TOTAL_JITTER, n_pitchers))
+        ).astype('int64')
+
+        pitchers, template_rows, counts = [], [], []
+        for pitcher, (template, total) in enumerate(zip(templates.tolist(), totals.tolist())):
+            rows = np.arange(self.template_starts[template], self.template_starts[template + 1])
+            row_counts = rng.multinomial(total, self.row_shares[rows] / self.row_shares[rows].sum())
+            thrown = row_counts > 0
+            pitchers.append(np.full(thrown.sum(), pitcher))
+            template_rows.append(rows[thrown])
+            counts.append(row_counts[thrown])
+        pitchers = np.concatenate(pitchers)
+        template_rows = np.concatenate(template_rows)
+        counts = np.concatenate(counts)
+        types = self.row_types[template_rows]
+
+        # Fresh shapes per pitch type, with a velocity offset shared by each pitcher's pitches
+        averages = np.empty((len(types), len(DRAWN_COLUMNS)))
+        velocity = DRAWN_COLUMNS.index('Avg_Velocity')
+        arm = rng.standard_normal(n_pitchers)
+        for code in np.unique(types).tolist():
+            rows = np.flatnonzero(types == code)
+            mean, cov = self.type_fits[code]
+            draws = rng.multivariate_normal(mean, cov, size=len(rows), method='eigh')
+            spread = math.sqrt(max(cov[velocity, velocity], 0.0))
+            draws[:, velocity] = (
+                mean[velocity]
+                + math.sqrt(1 - ARM_VELOCITY_WEIGHT ** 2) * (draws[:, velocity] - mean[velocity])
+                + ARM_VELOCITY_WEIGHT * arm[pitchers[rows]] * spread
+            )
+            averages[rows] = draws
+
+        # Release point comes from the template, so a pitcher's pitch types share it
+        release = self.template_release[templates][pitchers]
+        release = release + rng.normal(0.0, RELEASE_JITTER, release.shape)
+        known = np.isfinite(release)
+        for i, col in enumerate(RELEASE_COLUMNS):
+            column = DRAWN_COLUMNS.index(col)
+            averages[known[:, i], column] = release[known[:, i], i]
+
+        return pitchers, types, counts, self.row_tracked[template_rows], averages, self.template_hands[templates]
+
+
+def raw_pitches(model, rng, names, teams, team_codes, season, first_pitch_no):
+    """Raw pitch frame for one block of pitchers"""
+    n_pitchers = len(names)
+    pitchers, types, counts, tracked, averages, hands = model.pitch_type_rows(n_pitchers, rng)
+    rows = np.repeat(np.arange(len(types)), counts)
+    n = len(rows)
+
+    spread = np.array([RAW_SPREAD[col] for col in DRAWN_COLUMNS])
+    values = averages[rows] + rng.standard_normal((n, len(DRAWN_COLUMNS))) * spread
+    pitch_hands = hands[pitchers[rows]]
+    for col in MIRRORED_COLUMNS:
+        values[:, DRAWN_COLUMNS.index(col)] *= pitch_hands
+    untracked = ~tracked[rows]
+    for col in UNTRACKED_COLUMNS:
+        values[untracked, DRAWN_COLUMNS.index(col)] = np.nan
+
+    plate_side = rng.normal(*PLATE_SIDE, n)
+    plate_height = rng.normal(*PLATE_HEIGHT, n)
+    plate_side[untracked] = np.nan
+    plate_height[untracked] = np.nan
+
+    # Each pitcher appears in a few of their team's games; pitches are spread over those outings
+    pitch_counts = np.bincount(pitchers, weights=counts, minlength=n_pitchers)
+    outings = np.clip(np.round(pitch_counts / PITCHES_PER_OUTING), 1, GAMES_PER_TEAM).astype('int64')
+    outing_starts = np.concatenate(([0], np.cumsum(outings)))
+    games = np.concatenate([
+        rng.choice(GAMES_PER_TEAM, size=k, replace=False) for k in outings.tolist()
+    ])
+    pitch_pitchers = pitchers[rows]
+    pitch_outings = (rng.random(n) * outings[pitch_pitchers]).astype('int64')
+    pitch_games = games[outing_starts[pitch_pitchers] + pitch_outings]
+    game_ids = np.char.add(
+        np.char.add(f'{season}-', np.char.zfill(team_codes[pitch_pitchers].astype(str), 5)),
+        np.char.add('-', np.char.zfill(pitch_games.astype(str), 2))
+    )
+
+    raw = {
+        'PitchNo': np.arange(first_pitch_no, first_pitch_no + n),
+        'GameID': game_ids.astype(object),
+        'Pitcher': names[pitch_pitchers],
+        'PitcherTeam': teams[pitch_pitchers],
+        'TaggedPitchType': np.asarray(model.pitch_types, dtype=object)[types[rows]]
+    }
+    for col in SIMILARITY_FEATURES:
+        raw[PITCH_TYPE_AVERAGES[col]] = values[:, DRAWN_COLUMNS.index(col)]
+    raw['PlateLocSide'] = plate_side
+    raw['PlateLocHeight'] = plate_height
+    for col in RATING_COLUMNS:
+        raw[PITCH_TYPE_AVERAGES[col]] = values[:, DRAWN_COLUMNS.index(col)]
+    # Kept as float64 so values read back from the written text are exactly the ones summarized
+    for col, column in raw.items():
+        if column.dtype.kind == 'f':
+            raw[col] = np.round(column, RAW_DECIMALS)
+    return pd.DataFrame(raw)[RAW_COLUMNS]
+
+
+class _RawWriter:
+    """Appends raw pitch blocks to a CSV or Parquet file through Arrow's writers"""
+
+    def __init__(self, path, raw_format):
+        self.path = path
+        self.raw_format = raw_format
+        self._writer = None
+
+    def write(self, raw):
+        # NaN measurements become nulls: empty CSV fields, like the tracking exports
+        table = pa.Table.from_pandas(raw, preserve_index=False)
+        if self._writer is None:
+            if self.raw_format == 'parquet':
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            else:
+                options = pa_csv.WriteOptions(quoting_style='needed')
+                self._writer = pa_csv.CSVWriter(self.path, table.schema, write_options=options)
+        self._writer.write_table(table)
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def generate_season(model, pitches=DEFAULT_PITCHES, out_dir='.', season=DEFAULT_SEASON,
+                    seed=DEFAULT_SEED, raw_format='csv', write_raw=True):
+    """Write a synthetic season of about the given number of raw pitches
+
+    Returns (raw path or None, pitch type summary path, overall summary path, pitches written).
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    n_pitchers = max(1, math.ceil(pitches / model.expected_pitches_per_pitcher()))
+    names, teams, team_codes = model.roster(n_pitchers, np.random.default_rng([seed, 0]))
+
+    raw_path = os.path.join(out_dir, RAW_FILE_PATTERN.format(season=season, extension=RAW_FORMATS[raw_format]))
+    writer = _RawWriter(raw_path + '.tmp', raw_format) if write_raw else None
+    totals = []
+    written = 0
+    try:
+        for block, start in enumerate(range(0, n_pitchers, PITCHERS_PER_BLOCK)):
+            stop = min(start + PITCHERS_PER_BLOCK, n_pitchers)
+            rng = np.random.default_rng([seed, 1, block])
+            raw = raw_pitches(model, rng, names[start:stop], teams[start:stop], team_codes[start:stop], season, written)
+            # Blocks never share a pitcher, so their totals are simply stacked
+            totals.append(aggregate_chunk(raw))
+            if writer is not None:
+                writer.write(raw)
+            written += len(raw)
+    finally:
+        if writer is not None:
+            writer.close()
+    if writer is not None:
+        os.replace(raw_path + '.tmp', raw_path)
+
+    pitch_type, overall = summarize_totals(pd.concat(totals))
+    pitch_type_path = os.path.join(out_dir, PITCH_TYPE_FILE_PATTERN.format(season=season))
+    overall_path = os.path.join(out_dir, OVERALL_FILE_PATTERN.format(season=season))
+    pitch_type.to_csv(pitch_type_path, index=False)
+    overall.to_csv(overall_path, index=False)
+    return (raw_path if write_raw else None), pitch_type_path, overall_path, written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a synthetic season fitted from the shipped summaries")
+    parser.add_argument('--pitches', type=int, default=DEFAULT_PITCHES, help="Approximate raw pitches to generate")
+    parser.add_argument('--out', default='synthetic', help="Output directory")
+    parser.add_argument('--season', default=DEFAULT_SEASON, help="Season label used in file names and GameIDs")
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED, help="Random seed")
+    parser.add_argument('--format', choices=list(RAW_FORMATS), default='csv', help="Raw pitch file format")
+    parser.add_argument('--no-raw', action='store_true', help="Only write the summary tables")
+    parser.add_argument('--pitch-type-summary', default=PITCH_TYPE_SUMMARY_FILE, help="Pitch type summary to fit")
+    parser.add_argument('--overall-summary', default=OVERALL_SUMMARY_FILE, help="Overall summary to fit")
+    args = parser.parse_args()
+
+    model = SeasonModel.from_csv(args.pitch_type_summary, args.overall_summary)
+    raw_path, pitch_type_path, overall_path, written = generate_season(
+        model, args.pitches, args.out, args.season, args.seed, args.format, not args.no_raw
+    )
+    print(f"Generated {written:,} pitches")
+    for path in (raw_path, pitch_type_path, overall_path):
+        if path is not None:
+            print(f"  {path}")
+
+
+if __name__ == '__main__':
+    main()